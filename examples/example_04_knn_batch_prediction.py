@@ -0,0 +1,58 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor
+
+
+def predict_per_row(knn: KnnRegressor, X: np.ndarray) -> np.ndarray:
+    predictions = np.zeros((X.shape[0], 1))
+    for i, x in enumerate(X):
+        distances = np.sum((knn.X_train - x[np.newaxis, ...])**2, axis=1)
+        ids = np.argsort(distances)
+        predictions[i] = knn.rdfunc(knn.y_train[ids][:knn.k])
+    return predictions
+
+
+X_train, y_train = dg.LinearRegressionData(20000, 8, 5, random_state=1).get_data()
+X_test, _ = dg.LinearRegressionData(2000, 8, 5, random_state=2).get_data()
+
+for block_size in [256, 1024, 4096]:
+    knn_reg = KnnRegressor(k=5, block_size=block_size, algorithm="brute")
+    knn_reg.fit(X_train, y_train)
+
+    start = perf_counter()
+    y_loop = predict_per_row(knn_reg, X_test)
+    t_loop = perf_counter() - start
+
+    start = perf_counter()
+    y_batch = knn_reg.predict(X_test)
+    t_batch = perf_counter() - start
+
+    print(f"block_size={block_size:5d} | per-row: {t_loop:.3f}s | "
+          f"batched: {t_batch:.3f}s | speedup: {t_loop / t_batch:.1f}x | "
+          f"identical: {np.array_equal(y_loop, y_batch)}")
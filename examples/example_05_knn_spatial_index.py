@@ -0,0 +1,48 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor
+
+
+X_test, _ = dg.LinearRegressionData(200, 4, 5, random_state=2).get_data()
+
+for n_samples in [10000, 100000]:
+    X_train, y_train = dg.LinearRegressionData(n_samples, 4, 5, random_state=1).get_data()
+    for algorithm in ["brute", "kd_tree", "ball_tree"]:
+        knn_reg = KnnRegressor(k=5, algorithm=algorithm)
+        start = perf_counter()
+        knn_reg.fit(X_train, y_train)
+        t_fit = perf_counter() - start
+
+        start = perf_counter()
+        for x in X_test:
+            knn_reg.predict(x[np.newaxis, :])
+        t_query = (perf_counter() - start) / len(X_test)
+
+        print(f"n_samples={n_samples:6d} | {algorithm:9s} | fit: {t_fit:.3f}s | "
+              f"single-row predict: {t_query * 1e3:.2f}ms")
@@ -0,0 +1,50 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor
+
+
+X_train, y_train = dg.LinearRegressionData(50000, 16, 5, random_state=1).get_data()
+X_test, _ = dg.LinearRegressionData(8000, 16, 5, random_state=2).get_data()
+
+# n_jobs only shards the brute force search: the tree backends run their
+# queries in Python, holding the GIL, and always search serially
+reference = None
+for n_jobs in [1, 2, 4, 8]:
+    knn_reg = KnnRegressor(k=5, algorithm="brute", n_jobs=n_jobs)
+    knn_reg.fit(X_train, y_train)
+
+    start = perf_counter()
+    y_hat = knn_reg.predict(X_test)
+    elapsed = perf_counter() - start
+
+    if reference is None:
+        reference = (y_hat, elapsed)
+    print(f"n_jobs={n_jobs} | predict: {elapsed:.3f}s | "
+          f"speedup: {reference[1] / elapsed:.2f}x | "
+          f"identical to serial: {np.array_equal(reference[0], y_hat)}")
@@ -0,0 +1,54 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from time import perf_counter
+
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor
+from mlpy.metrics import knn_recall
+
+
+X_train, y_train = dg.LinearRegressionData(100000, 16, 5, random_state=1).get_data()
+X_test, _ = dg.LinearRegressionData(500, 16, 5, random_state=2).get_data()
+
+exact = KnnRegressor(k=10, algorithm="brute")
+exact.fit(X_train, y_train)
+start = perf_counter()
+exact_neighbors = exact.kneighbors(X_test)
+print(f"exact     | query: {perf_counter() - start:.3f}s")
+
+for n_trees in [1, 5, 10, 20]:
+    approx = KnnRegressor(k=10, algorithm="rp_forest", n_trees=n_trees, 
+                          leaf_size=200, random_state=0)
+    start = perf_counter()
+    approx.fit(X_train, y_train)
+    t_fit = perf_counter() - start
+
+    start = perf_counter()
+    approx_neighbors = approx.kneighbors(X_test)
+    t_query = perf_counter() - start
+
+    recall = knn_recall(exact_neighbors, approx_neighbors)
+    print(f"n_trees={n_trees:2d} | fit: {t_fit:.3f}s | query: {t_query:.3f}s | "
+          f"recall@10: {recall:.3f}")
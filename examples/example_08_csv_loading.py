@@ -0,0 +1,85 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import re
+import shutil
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.data.datasets import Dataset
+
+
+def parse_csv_per_line(path: str) -> dict:
+    """Line-by-line loader the typed chunked parser replaced"""
+    file = open(path)
+    header = [i.strip("\"") for i in file.readline().strip("\n").split(",")]
+    data = {column: [] for column in header}
+    for line in file:
+        rfloat = re.compile("[-+]? (?: (?: \d* \. \d+ ) " \
+                    + "| (?: \d+ \.? ) )(?: [Ee] [+-]? \d+ ) ?", re.VERBOSE)
+        for column, substring in zip(header, line.strip("\n").split(",")):
+            if bool(rfloat.match(substring)):
+                value = int(substring) if substring.isdigit() else float(substring)
+            elif substring in ["True", "False"]:
+                value = int(eval(substring))
+            else:
+                value = substring
+            data[column].append(value)
+    file.close()
+    return data
+
+
+def measure(loader, path: str) -> tuple[float, float]:
+    start = perf_counter()
+    loader(path)
+    elapsed = perf_counter() - start
+    tracemalloc.start()
+    loader(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+path = os.path.join("data_output", "benchmark_linear_data.csv")
+X, y = dg.LinearRegressionData(500000, 8, 5, random_state=1).get_data()
+np.savetxt(path, np.hstack([X[:, 1:], y]), delimiter=",", 
+           header=",".join([f"x{i}" for i in range(8)] + ["y"]), comments="")
+print(f"file size: {os.path.getsize(path) / 2**20:.1f} MiB")
+
+for label, loader in [("per-line", parse_csv_per_line), ("chunked", Dataset)]:
+    elapsed, peak = measure(loader, path)
+    print(f"{label:8s} | load: {elapsed:.2f}s | peak memory: {peak:.1f} MiB")
+
+start = perf_counter()
+n_rows = sum(len(chunk["y"]) for chunk in Dataset(path, lazy=True).iter_chunks(rows=100000))
+print(f"streamed {n_rows} rows in {perf_counter() - start:.2f}s")
+
+shutil.rmtree(Dataset.cache_path(path), ignore_errors=True)
+for label in ["cache miss", "cache hit"]:
+    start = perf_counter()
+    Dataset(path, cache=True)
+    print(f"{label:10s} | load: {perf_counter() - start:.3f}s")
@@ -0,0 +1,53 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.data.datasets import Dataset
+from mlpy.regression import LinearRegressor
+
+
+path = os.path.join("data_output", "streaming_linear_data.csv")
+columns = [f"x{i}" for i in range(8)]
+X, y = dg.LinearRegressionData(200000, 8, 5, random_state=1).get_data()
+np.savetxt(path, np.hstack([X[:, 1:], y]), delimiter=",", 
+           header=",".join(columns + ["y"]), comments="")
+
+lin_reg_pinv = LinearRegressor(name="pinv-lin-reg")
+start = perf_counter()
+lin_reg_pinv.fit(X, y)
+print(f"pinv (in memory) | fit: {perf_counter() - start:.3f}s")
+
+lin_reg_stream = LinearRegressor(solver="incremental", name="streaming-lin-reg")
+start = perf_counter()
+for chunk in Dataset(path, lazy=True).iter_chunks(rows=20000):
+    X_chunk = np.column_stack([np.ones(len(chunk["y"]))] + [chunk[c] for c in columns])
+    lin_reg_stream.partial_fit(X_chunk, chunk["y"][:, np.newaxis])
+print(f"incremental (streamed from csv) | fit: {perf_counter() - start:.3f}s")
+
+print(f"max weight difference: {np.abs(lin_reg_pinv.weights - lin_reg_stream.weights).max():.2e}")
+os.remove(path)
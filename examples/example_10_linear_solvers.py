@@ -0,0 +1,49 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import LinearRegressor
+
+
+solvers = ["pinv", "cholesky", "qr", "lstsq", "auto"]
+
+print(f"{'n_samples':>9s} {'n_features':>10s} | " 
+      + " | ".join(f"{solver:>19s}" for solver in solvers))
+for n_samples in [1000, 10000, 100000]:
+    for n_features in [5, 50, 200]:
+        datagen = dg.LinearRegressionData(n_samples, n_features, 5, random_state=1)
+        X, y = datagen.get_data()
+        cells = []
+        for solver in solvers:
+            lin_reg = LinearRegressor(solver=solver)
+            start = perf_counter()
+            lin_reg.fit(X, y)
+            elapsed = perf_counter() - start
+            error = np.abs(lin_reg.weights - datagen.get_weights()).max()
+            cells.append(f"{elapsed * 1e3:8.1f}ms {error:.1e}")
+        print(f"{n_samples:9d} {n_features:10d} | " + " | ".join(cells))
+print("cells: fit time, max abs error against the ground truth weights")
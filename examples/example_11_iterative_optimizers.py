@@ -0,0 +1,53 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import tracemalloc
+from time import perf_counter
+
+from mlpy.data import data_generator as dg
+from mlpy.regression import LinearRegressor
+from mlpy.metrics import mse
+
+
+X, y = dg.LinearRegressionData(200000, 20, 5, random_state=1).get_data()
+
+configs = {
+    "GD": dict(solver="gradient_descent", max_iter=200),
+    "SGD": dict(solver="sgd", batch_size=256, max_iter=50),
+    "SGD + momentum": dict(solver="sgd", batch_size=256, max_iter=50, momentum=0.9,
+                           learning_rate=1e-4),
+    "Adam": dict(solver="sgd", batch_size=256, max_iter=50, optimizer="adam", 
+                 learning_rate=0.05, lr_schedule="inverse_scaling"),
+}
+
+for label, config in configs.items():
+    lin_reg = LinearRegressor(**config)
+    tracemalloc.start()
+    start = perf_counter()
+    lin_reg.fit(X, y)
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:15s} | epochs: {lin_reg.n_iter:4d} | fit: {elapsed:.2f}s | "
+          f"peak memory: {peak / 2**20:.1f} MiB | mse: {mse(y, lin_reg.predict(X)):.3f}")
@@ -0,0 +1,66 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from time import perf_counter
+
+import numpy as np
+from mlpy.regression import LinearRegressor
+
+
+generator = np.random.default_rng(1)
+n_models, n_samples, n_features = 2000, 200, 6
+X = generator.uniform(-25, 25, (n_models, n_samples, n_features))
+X[..., 0] = 1
+W = generator.normal(0, 1, (n_models, n_features, 1))
+y = X @ W + generator.normal(0, 5, (n_models, n_samples, 1))
+
+for solver in ["pinv", "cholesky"]:
+    start = perf_counter()
+    looped = []
+    for X_, y_ in zip(X, y):
+        lin_reg = LinearRegressor(solver=solver)
+        lin_reg.fit(X_, y_)
+        looped.append(lin_reg.weights)
+    t_loop = perf_counter() - start
+
+    lin_reg = LinearRegressor(solver=solver)
+    start = perf_counter()
+    lin_reg.fit_batched(X, y)
+    t_batched = perf_counter() - start
+
+    error = np.abs(np.stack(looped) - lin_reg.weights).max()
+    print(f"{solver:8s} | {n_models} models | loop: {t_loop:.3f}s | "
+          f"batched: {t_batched:.3f}s | speedup: {t_loop / t_batched:.1f}x | "
+          f"max weight difference: {error:.1e}")
+
+Y = np.concatenate(list(y[:50]), axis=1)
+X_shared = X[0]
+start = perf_counter()
+for target in Y.T:
+    LinearRegressor(solver="cholesky").fit(X_shared, target[:, np.newaxis])
+t_loop = perf_counter() - start
+start = perf_counter()
+LinearRegressor(solver="cholesky").fit(X_shared, Y)
+print(f"50 targets sharing X | loop: {t_loop:.4f}s | "
+      f"one factorization: {perf_counter() - start:.4f}s")
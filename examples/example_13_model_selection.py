@@ -0,0 +1,63 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor, LinearRegressor
+from mlpy.model_selection import GridSearch, RandomSearch, KFold
+from mlpy.metrics import mse
+
+
+X, y = dg.LinearRegressionData(5000, 3, 5, random_state=1).get_data()
+cv = KFold(5, shuffle=True, random_state=0)
+ks = list(range(1, 41))
+
+start = perf_counter()
+naive_scores = []
+for k in ks:
+    scores = []
+    for train_idx, test_idx in cv.split(len(X)):
+        knn_reg = KnnRegressor(k=k)
+        knn_reg.fit(X[train_idx], y[train_idx])
+        scores.append(mse(y[test_idx], knn_reg.predict(X[test_idx])))
+    naive_scores.append(np.mean(scores))
+t_naive = perf_counter() - start
+
+start = perf_counter()
+search = GridSearch(KnnRegressor, {"k": ks}, cv=cv).fit(X, y)
+t_search = perf_counter() - start
+
+print(f"KNN k=1..40 | hand-written loop: {t_naive:.2f}s | GridSearch: {t_search:.2f}s | "
+      f"best: {search.best_params} ({search.best_score:.3f}) | "
+      f"same scores: {np.allclose(naive_scores, [r['mean_score'] for r in search.results])}")
+
+search = RandomSearch(
+    LinearRegressor, 
+    {"solver": ["sgd"], "batch_size": [16, 32, 64, 128], 
+     "learning_rate": lambda generator: 10**generator.uniform(-5, -3)},
+    n_iter=8, cv=cv, n_jobs=4
+).fit(X, y)
+print(f"LinearRegressor SGD | best: {search.best_params} ({search.best_score:.3f})")
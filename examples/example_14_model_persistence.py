@@ -0,0 +1,52 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import shutil
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor
+from mlpy.__common import BaseModel
+
+
+path = os.path.join("data_output", "knn_model")
+X_train, y_train = dg.LinearRegressionData(1000000, 8, 5, random_state=1).get_data()
+X_test, _ = dg.LinearRegressionData(100, 8, 5, random_state=2).get_data()
+
+knn_reg = KnnRegressor(k=5, algorithm="kd_tree")
+knn_reg.fit(X_train, y_train)
+start = perf_counter()
+knn_reg.save(path)
+print(f"save: {perf_counter() - start:.3f}s")
+
+for mmap in [False, True]:
+    start = perf_counter()
+    loaded = BaseModel.load(path, mmap=mmap)
+    elapsed = perf_counter() - start
+    same = np.array_equal(loaded.predict(X_test), knn_reg.predict(X_test))
+    print(f"load (mmap={mmap}): {elapsed:.3f}s | identical predictions: {same}")
+
+shutil.rmtree(path)
@@ -0,0 +1,59 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from time import perf_counter_ns
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import LinearRegressor, KnnRegressor
+
+
+def latency(predict, X: np.ndarray) -> tuple[float, float]:
+    timings = np.empty(len(X))
+    for i, x in enumerate(X):
+        start = perf_counter_ns()
+        predict(x)
+        timings[i] = perf_counter_ns() - start
+    return np.percentile(timings, 50) / 1e3, np.percentile(timings, 99) / 1e3
+
+
+X_train, y_train = dg.LinearRegressionData(100000, 8, 5, random_state=1).get_data()
+X_test, _ = dg.LinearRegressionData(2000, 8, 5, random_state=2).get_data()
+
+lin_reg = LinearRegressor()
+lin_reg.fit(X_train, y_train)
+lin_reg_1d = LinearRegressor()
+lin_reg_1d.fit(X_train, y_train[:, 0])
+knn_reg = KnnRegressor(k=5, algorithm="brute")
+knn_reg.fit(X_train, y_train)
+
+for label, model in [("LinearRegressor", lin_reg), ("LinearRegressor (1-D y)", lin_reg_1d), 
+                     ("KnnRegressor", knn_reg)]:
+    out = np.empty_like(model.predict_one(X_test[0]))
+    p50, p99 = latency(lambda x: model.predict(x[np.newaxis, :]), X_test)
+    print(f"{label:23s} | predict      | p50: {p50:8.1f}us | p99: {p99:8.1f}us")
+    p50, p99 = latency(lambda x: model.predict_one(x, out=out), X_test)
+    print(f"{label:23s} | predict_one  | p50: {p50:8.1f}us | p99: {p99:8.1f}us")
+    same = all(np.array_equal(model.predict_one(x), model.predict(x[np.newaxis, :])[0]) for x in X_test[:100])
+    print(f"{label:23s} | identical predictions: {same}")
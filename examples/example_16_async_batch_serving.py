@@ -0,0 +1,70 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor
+from mlpy.serving import AsyncBatchPredictor
+
+
+N_CLIENTS = 64
+REQUESTS_PER_CLIENT = 20
+
+
+async def client(predict, X: np.ndarray, latencies: list):
+    for x in X:
+        start = perf_counter()
+        await predict(x)
+        latencies.append(perf_counter() - start)
+
+
+async def load_test(predict, X: np.ndarray) -> tuple[float, list]:
+    latencies = []
+    shards = np.array_split(X, N_CLIENTS)
+    start = perf_counter()
+    await asyncio.gather(*[client(predict, shard, latencies) for shard in shards])
+    return len(X) / (perf_counter() - start), latencies
+
+
+async def main():
+    X_train, y_train = dg.LinearRegressionData(100000, 8, 5, random_state=1).get_data()
+    X_test, _ = dg.LinearRegressionData(N_CLIENTS * REQUESTS_PER_CLIENT, 8, 5, random_state=2).get_data()
+    knn_reg = KnnRegressor(k=5, algorithm="brute")
+    knn_reg.fit(X_train, y_train)
+    loop = asyncio.get_running_loop()
+
+    async def naive_predict(x):
+        return (await loop.run_in_executor(None, knn_reg.predict, x[np.newaxis, :]))[0]
+
+    async with AsyncBatchPredictor(knn_reg, max_batch_size=64, max_wait=2e-3) as predictor:
+        for label, predict in [("per-request", naive_predict), ("micro-batched", predictor.predict)]:
+            throughput, latencies = await load_test(predict, X_test)
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+            print(f"{label:13s} | {throughput:8.1f} rows/s | p50: {p50:7.1f}ms | p99: {p99:7.1f}ms")
+
+
+asyncio.run(main())
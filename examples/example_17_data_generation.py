@@ -0,0 +1,86 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+
+
+def measure(function) -> tuple[float, float]:
+    tracemalloc.start()
+    start = perf_counter()
+    function()
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def hstack_get_data(datagen: dg.LinearRegressionData):
+    """Generation with a separate bias column stacked afterwards"""
+    generator = np.random.default_rng(datagen.random_state)
+    X = generator.uniform(*datagen.val_range, (datagen.n_samples, datagen.n_features))
+    X = np.hstack([np.ones((datagen.n_samples, 1)), X])
+    eps = generator.normal(0, datagen.noise_std, (datagen.n_samples, 1))
+    return X, X @ datagen.get_weights() + eps
+
+
+n_samples, n_features = 2000000, 10
+size = n_samples * (n_features + 2) * 8 / 2**20
+print(f"float64 output size: {size:.1f} MiB")
+
+datagen = dg.LinearRegressionData(n_samples, n_features, 5, random_state=1)
+path = os.path.join("data_output", "generated")
+runs = {
+    "hstack": lambda: hstack_get_data(datagen),
+    "get_data": lambda: datagen.get_data(),
+    "get_data float32": lambda: dg.LinearRegressionData(n_samples, n_features, 5, random_state=1,
+                                                        dtype=np.float32).get_data(),
+    "get_data memmap": lambda: datagen.get_data(mmap_path=path),
+    "iter_batches": lambda: sum(len(X) for X, _ in datagen.iter_batches(100000)),
+}
+for label, function in runs.items():
+    elapsed, peak = measure(function)
+    print(f"{label:16s} | time: {elapsed:.2f}s | peak memory: {peak:7.1f} MiB")
+
+for suffix in ["_X.npy", "_y.npy"]:
+    os.remove(path + suffix)
+
+reference = None
+for n_jobs in [1, 2, 4, 8]:
+    datagen = dg.LinearRegressionData(n_samples, n_features, 5, random_state=1, n_jobs=n_jobs)
+    start = perf_counter()
+    X, y = datagen.get_data()
+    elapsed = perf_counter() - start
+    reference = (X, y) if reference is None else reference
+    same = np.array_equal(X, reference[0]) and np.array_equal(y, reference[1])
+    print(f"n_jobs={n_jobs} | time: {elapsed:.2f}s | identical to n_jobs=1: {same}")
+
+for generator_class in [dg.ClusteredRegressionData, dg.NonlinearRegressionData]:
+    start = perf_counter()
+    generator_class(n_samples, n_features, random_state=1, n_jobs=4).get_data()
+    print(f"{generator_class.__name__} | time: {perf_counter() - start:.2f}s")
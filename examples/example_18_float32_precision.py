@@ -0,0 +1,71 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor, LinearRegressor
+from mlpy.metrics import mse
+
+
+def measure(function) -> tuple[float, float, object]:
+    tracemalloc.start()
+    start = perf_counter()
+    result = function()
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, result
+
+
+def fit_predict(model, X_train, y_train, X_test):
+    model.fit(X_train, y_train)
+    return model.predict(X_test)
+
+
+n_train, n_test, n_features = 200000, 5000, 16
+X, y = dg.LinearRegressionData(n_train + n_test, n_features, 5, random_state=1).get_data()
+X_train, y_train, X_test, y_test = X[:n_train], y[:n_train], X[n_train:], y[n_train:]
+
+for label, make_model in [
+    ("knn brute", lambda dtype: KnnRegressor(k=5, algorithm="brute", dtype=dtype)),
+    ("gradient descent", lambda dtype: LinearRegressor("gradient_descent", max_iter=100, learning_rate=1e-4,
+                                                       random_state=0, dtype=dtype)),
+    ("cholesky", lambda dtype: LinearRegressor("cholesky", dtype=dtype)),
+]:
+    reference = None
+    for dtype in [np.float64, np.float32]:
+        # the float32 inputs are prepared outside the measurement
+        X_train_, y_train_, X_test_ = X_train.astype(dtype), y_train.astype(dtype), X_test.astype(dtype)
+        elapsed, peak, y_pred = measure(lambda: fit_predict(make_model(dtype), X_train_, y_train_, X_test_))
+        reference = y_pred if reference is None else reference
+        print(f"{label:16s} {np.dtype(dtype).name} | time: {elapsed:.2f}s | peak memory: {peak:7.1f} MiB"
+              f" | mse: {mse(y_test, y_pred):.6f} | max deviation from float64: "
+              f"{np.max(np.abs(y_pred - reference)):.2e}")
+
+for dtype in [np.float64, np.float32]:
+    datagen = dg.LinearRegressionData(2000000, n_features, 5, random_state=1, dtype=dtype)
+    elapsed, peak, _ = measure(datagen.get_data)
+    print(f"get_data {np.dtype(dtype).name} | time: {elapsed:.2f}s | peak memory: {peak:7.1f} MiB")
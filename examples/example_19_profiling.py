@@ -0,0 +1,53 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import timeit
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor, LinearRegressor
+from mlpy.profiling import MemorySink, CallbackSink
+
+
+X, y = dg.LinearRegressionData(50000, 16, 5, random_state=1).get_data()
+
+model = KnnRegressor(k=5, algorithm="brute")
+model.fit(X[:40000], y[:40000])
+profiler = model.enable_profiling(MemorySink())
+model.predict(X[40000:])
+for event, stats in profiler.sinks[0].summary().items():
+    print(f"{event:22s} | calls: {stats['count']:4d} | total: {stats['total_time']:.3f}s"
+          f" | {stats['rows_per_second']:.3g} rows/s")
+
+model = LinearRegressor("gradient_descent", max_iter=10, learning_rate=1e-4)
+model.enable_profiling(CallbackSink(lambda record: print(record)))
+model.fit(X, y)
+
+# overhead of the instrumentation on the single row serving path
+model = KnnRegressor(k=5, algorithm="brute")
+model.fit(X[:40000], y[:40000])
+for label in ["disabled", "enabled"]:
+    if label == "enabled":
+        model.enable_profiling(MemorySink())
+    elapsed = min(timeit.repeat(lambda: model.predict_one(X[0]), number=1000, repeat=5)) / 1000
+    print(f"predict_one profiling {label:8s} | {elapsed * 1e6:.1f} us")
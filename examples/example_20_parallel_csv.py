@@ -0,0 +1,51 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import os
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.data.datasets import Dataset
+
+
+path = os.path.join("data_output", "benchmark_parallel_csv.csv")
+X, y = dg.LinearRegressionData(2000000, 8, 5, random_state=1).get_data()
+np.savetxt(path, np.hstack([X[:, 1:], y]), delimiter=",", 
+           header=",".join([f"x{i}" for i in range(8)] + ["y"]), comments="")
+print(f"file size: {os.path.getsize(path) / 2**20:.1f} MiB | cores: {os.cpu_count()}")
+
+reference, serial_time = None, None
+for n_jobs in [1, 2, 4, 8]:
+    start = perf_counter()
+    dataset = Dataset(path, n_jobs=n_jobs)
+    elapsed = perf_counter() - start
+    if reference is None:
+        reference, serial_time = dataset, elapsed
+    same = dataset.dtypes == reference.dtypes and all(
+        np.array_equal(dataset[column], reference[column]) for column in reference.header
+    )
+    print(f"n_jobs={n_jobs} | load: {elapsed:.2f}s | speedup: {serial_time / elapsed:.2f}x"
+          f" | identical to serial: {same}")
+
+os.remove(path)
@@ -0,0 +1,62 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor
+
+
+X, y = dg.ClusteredRegressionData(120000, 8, random_state=1).get_data()
+X_test, X_stream, y_stream = X[:1000], X[1000:], y[1000:]
+n_initial, batch = 20000, 500
+
+for algorithm in ["brute", "kd_tree"]:
+    incremental = KnnRegressor(k=5, algorithm=algorithm)
+    incremental.fit(X_stream[:n_initial], y_stream[:n_initial])
+    add_time, refit_time = 0.0, 0.0
+    for start in range(n_initial, len(X_stream), batch):
+        begin = perf_counter()
+        incremental.add(X_stream[start:start + batch], y_stream[start:start + batch])
+        add_time += perf_counter() - begin
+        begin = perf_counter()
+        KnnRegressor(k=5, algorithm=algorithm).fit(X_stream[:start + batch], y_stream[:start + batch])
+        refit_time += perf_counter() - begin
+    n_rows = len(X_stream) - n_initial
+    print(f"{algorithm:8s} | add: {add_time / n_rows * 1e6:.2f} us/row | refit: {refit_time / n_rows * 1e6:.2f} us/row")
+    
+    begin = perf_counter()
+    incremental.predict(X_test[:200])
+    predict_time = perf_counter() - begin
+    begin = perf_counter()
+    incremental.remove(np.arange(0, len(incremental.X_train), 3))
+    print(f"{algorithm:8s} | removed {len(incremental.X_train) // 3} rows in {perf_counter() - begin:.3f}s")
+    begin = perf_counter()
+    y_removed = incremental.predict(X_test[:200])
+    print(f"{algorithm:8s} | predict: {predict_time:.3f}s before removal, {perf_counter() - begin:.3f}s after")
+    keep = np.isfinite(incremental.train_norms)
+    reference = KnnRegressor(k=5, algorithm=algorithm)
+    reference.fit(incremental.X_train[keep], incremental.y_train[keep])
+    same = np.array_equal(y_removed, reference.predict(X_test[:200]))
+    print(f"{algorithm:8s} | predictions identical to a full refit: {same}")
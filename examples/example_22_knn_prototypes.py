@@ -0,0 +1,52 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.regression import KnnRegressor, reduction_report
+
+
+X, y = dg.ClusteredRegressionData(62000, 8, random_state=1).get_data()
+X_test, y_test, X_train, y_train = X[:2000], y[:2000], X[2000:], y[2000:]
+
+full = KnnRegressor(k=5, algorithm="brute")
+full.fit(X_train, y_train)
+
+for params in [
+    {"prototypes": "kmeans", "n_prototypes": 1000},
+    {"prototypes": "kmeans", "n_prototypes": 4000},
+    {"prototypes": "condensed", "prototype_tolerance": 2.5},
+    {"prototypes": "condensed", "prototype_tolerance": 1.0},
+    {"prototypes": "condensed", "prototype_tolerance": 1.0, "n_prototypes": 4000},
+]:
+    reduced = KnnRegressor(k=5, algorithm="brute", **params)
+    start = perf_counter()
+    reduced.fit(X_train, y_train)
+    fit_time = perf_counter() - start
+    report = reduction_report(full, reduced, X_test, y_test)
+    print(f"{params}\n    prototypes: {report['reduced']['n_reference']} ({report['gain']['size_ratio']:.1%}) "
+          f"| fit: {fit_time:.2f}s | predict speedup: {report['gain']['speedup']:.1f}x "
+          f"| mse: {report['full']['mse']:.3f} -> {report['reduced']['mse']:.3f} "
+          f"| r2: {report['full']['r2_score']:.4f} -> {report['reduced']['r2_score']:.4f}")
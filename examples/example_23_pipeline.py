@@ -0,0 +1,78 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import timeit
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+from mlpy.data import data_generator as dg
+from mlpy.preprocessing import StandardScaler, PolynomialFeatures
+from mlpy.pipeline import Pipeline
+from mlpy.regression import LinearRegressor
+
+
+def measure(function) -> tuple[float, float, object]:
+    tracemalloc.start()
+    start = perf_counter()
+    result = function()
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, result
+
+
+def manual_predict(X: np.ndarray, mean: np.ndarray, std: np.ndarray, model: LinearRegressor):
+    """Standardization outside the library, with full-size temporaries"""
+    return model.predict((X - mean) / np.where(std > 0, std, 1))
+
+
+X, y = dg.LinearRegressionData(1000000, 16, 5, random_state=1).get_data()
+print(f"input size: {X.nbytes / 2**20:.1f} MiB")
+
+pipeline = Pipeline([StandardScaler()], LinearRegressor("cholesky"), block_size=65536).fit(X, y)
+folded = Pipeline([StandardScaler()], LinearRegressor("cholesky"), fold=True).fit(X, y)
+mean, std = X.mean(0), X.std(0)
+std[0], mean[0] = 1, 0
+manual_model = LinearRegressor("cholesky")
+manual_model.fit((X - mean) / std, y)
+
+reference = None
+for label, function in [
+    ("manual scaling", lambda: manual_predict(X, mean, std, manual_model)),
+    ("pipeline", lambda: pipeline.predict(X)),
+    ("folded pipeline", lambda: folded.predict(X)),
+]:
+    elapsed, peak, y_pred = measure(function)
+    reference = y_pred if reference is None else reference
+    print(f"predict {label:16s} | time: {elapsed:.3f}s | peak memory: {peak:7.1f} MiB"
+          f" | max deviation: {np.max(np.abs(y_pred - reference)):.2e}")
+
+for label, model in [("pipeline", pipeline), ("folded pipeline", folded)]:
+    elapsed = min(timeit.repeat(lambda: model.predict_one(X[0]), number=1000, repeat=5)) / 1000
+    print(f"predict_one {label:16s} | {elapsed * 1e6:.1f} us")
+
+# the polynomial features bring their own bias column
+elapsed, peak, _ = measure(lambda: Pipeline([StandardScaler(), PolynomialFeatures(2, include_bias=True)], 
+                                            LinearRegressor("cholesky"), block_size=65536).fit(X[:200000, 1:], y[:200000]))
+print(f"fit scaler + polynomial features (200000 rows) | time: {elapsed:.2f}s | peak memory: {peak:.1f} MiB")
@@ -22,8 +22,185 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+# site-packages
+import numpy as np
 
-class BaseModel:
+# native
+import os
+import json
+import inspect
+import importlib
+
+# local
+from .profiling import Profiler, MemorySink, NULL_SPAN, timed
+
+
+MODEL_FORMAT_VERSION = 1
+
+
+def _qualified_name(obj) -> str:
+    return f"{type(obj).__module__}:{type(obj).__qualname__}"
+
+
+def _import_qualified(name: str) -> type:
+    module, qualname = name.split(":")
+    obj = importlib.import_module(module)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _dump_value(value, path: str, key: str, arrays: dict = None):
+    """Converts a value into a JSON-compatible description, writing arrays
+    to `<key>.npy` files inside `path`. An array reachable from several 
+    attributes (e.g. the training data shared with a search index) is 
+    written once: `arrays` maps the id of every array already written to 
+    the array and its description. Callables are skipped (returns 
+    Ellipsis), they are rebuilt by the constructor on load.
+    """
+    arrays = dict() if arrays is None else arrays
+    if isinstance(value, np.ndarray):
+        if id(value) in arrays:
+            return arrays[id(value)][1]
+        description = _dump_array(value, path, key)
+        # the array is kept so its id is not reused while saving
+        arrays[id(value)] = (value, description)
+        return description
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.dtype) or (isinstance(value, type) and issubclass(value, np.generic)):
+        return {"__dtype__": np.dtype(value).str}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        items = [_dump_value(item, path, f"{key}.{i}", arrays) for i, item in enumerate(value)]
+        items = [None if item is Ellipsis else item for item in items]
+        return {"__list__": items, "tuple": isinstance(value, tuple)}
+    if isinstance(value, dict) and all(isinstance(name, str) for name in value):
+        items = {name: _dump_value(item, path, f"{key}.{name}", arrays) for name, item in value.items()}
+        return {"__dict__": {name: item for name, item in items.items() if item is not Ellipsis}}
+    if isinstance(value, np.random.Generator):
+        return {"__generator__": value.bit_generator.state}
+    if callable(value) or not hasattr(value, "__dict__"):
+        return Ellipsis
+    if isinstance(value, Instrumented):
+        # nested models and transforms are rebuilt by their constructor
+        return {"__object__": _qualified_name(value), "params": value._init_params(),
+                "state": _dump_value(value._persistent_state(), path, key, arrays)}
+    return {"__object__": _qualified_name(value), "state": _dump_value(vars(value), path, key, arrays)}
+
+
+def _dump_array(array: np.ndarray, path: str, key: str) -> dict:
+    filename = f"{key}.npy"
+    if array.dtype == object:
+        # object arrays can only be pickled, and are never memory-mapped
+        np.save(os.path.join(path, filename), array, allow_pickle=True)
+        return {"__array__": filename, "pickled": True}
+    np.save(os.path.join(path, filename), array, allow_pickle=False)
+    return {"__array__": filename}
+
+
+def _load_value(value, path: str, mmap: bool, arrays: dict = None):
+    """Rebuilds a value from its `_dump_value` description. `arrays` maps 
+    the files already loaded to their array, so attributes that shared an
+    array when saved share it again.
+    """
+    arrays = dict() if arrays is None else arrays
+    if not isinstance(value, dict):
+        return value
+    if "__array__" in value:
+        filename = os.path.join(path, value["__array__"])
+        if filename not in arrays:
+            if value.get("pickled", False):
+                arrays[filename] = np.load(filename, allow_pickle=True)
+            else:
+                arrays[filename] = np.load(filename, mmap_mode="r" if mmap else None)
+        return arrays[filename]
+    if "__list__" in value:
+        items = [_load_value(item, path, mmap, arrays) for item in value["__list__"]]
+        return tuple(items) if value["tuple"] else items
+    if "__dict__" in value:
+        return {name: _load_value(item, path, mmap, arrays) for name, item in value["__dict__"].items()}
+    if "__dtype__" in value:
+        return np.dtype(value["__dtype__"])
+    if "__generator__" in value:
+        bit_generator = getattr(np.random, value["__generator__"]["bit_generator"])()
+        bit_generator.state = value["__generator__"]
+        return np.random.Generator(bit_generator)
+    cls = _import_qualified(value["__object__"])
+    obj = cls(**value["params"]) if "params" in value else cls.__new__(cls)
+    obj.__dict__.update(_load_value(value["state"], path, mmap, arrays))
+    return obj
+
+
+class Instrumented:
+    """Opt-in profiling shared by models and transforms
+    
+    `enable_profiling` replaces the public entry points listed in 
+    `_profiled_methods` by timed wrappers on the instance and `_span` / 
+    `_record` calls inside the algorithms start reporting phases. While 
+    disabled the methods are the plain class methods and `_span` returns a
+    shared no-op span, so the instrumentation costs an attribute lookup.
+    """
+    # attributes holding caches or scratch buffers, not saved by `save`
+    _transient_attributes = []
+    _profiled_methods = []
+    _profiler = None
+    
+    def enable_profiling(self, *sinks) -> Profiler:
+        """Starts recording calls and phases
+
+        Args:
+            *sinks (Sink): Record destinations. Defaults to a MemorySink.
+
+        Returns:
+            Profiler: Profiler holding the sinks
+        """
+        self.disable_profiling()
+        profiler = Profiler(self.name, list(sinks) or [MemorySink()])
+        for name in self._profiled_methods:
+            method = getattr(self, name, None)
+            if method is not None:
+                setattr(self, name, timed(profiler, name, method))
+        self._profiler = profiler
+        return profiler
+    
+    def disable_profiling(self):
+        """Stops recording and restores the plain methods. The sinks are 
+        not closed.
+        """
+        for name in self._profiled_methods:
+            self.__dict__.pop(name, None)
+        self.__dict__.pop("_profiler", None)
+        
+    def _init_params(self) -> dict:
+        """Constructor arguments stored as plain values"""
+        params = dict()
+        for name in inspect.signature(type(self).__init__).parameters:
+            value = getattr(self, name, None)
+            if name != "self" and (value is None or isinstance(value, (bool, int, float, str))):
+                params[name] = value
+        return params
+    
+    def _persistent_state(self) -> dict:
+        return {
+            name: value for name, value in vars(self).items() 
+            if name not in self._transient_attributes and name != "_profiler"
+            and name not in self._profiled_methods
+        }
+        
+    def _span(self, event: str, rows: int = None, **fields):
+        profiler = self._profiler
+        return NULL_SPAN if profiler is None else profiler.span(event, rows, **fields)
+    
+    def _record(self, event: str, **fields):
+        if self._profiler is not None:
+            self._profiler.record(event, **fields)
+
+
+class BaseModel(Instrumented):
+    _profiled_methods = ["fit", "predict", "predict_one", "partial_fit", "fit_batched", "kneighbors"]
+    
     def __init__(self, name: str = "model"):
         self.name = name
         
@@ -35,9 +212,52 @@ class BaseModel:
     
     def predict_proba(self, *args, **kwargs):
         raise NotImplementedError(f"Not available for {self.__class__}")
+    
+    def save(self, path: str):
+        """Saves the model to a directory: every array attribute (weights, 
+        training data, index structures) goes to its own uncompressed .npy 
+        file and the hyperparameters and remaining state to manifest.json
 
+        Args:
+            path (str): Output directory
+        """
+        os.makedirs(path, exist_ok=True)
+        manifest = {
+            "version": MODEL_FORMAT_VERSION,
+            "class": _qualified_name(self),
+            "params": self._init_params(),
+            "state": _dump_value(self._persistent_state(), path, "model")["__dict__"]
+        }
+        with open(os.path.join(path, "manifest.json"), "w") as file:
+            json.dump(manifest, file, indent=2)
+            
+    @staticmethod
+    def load(path: str, mmap: bool = True):
+        """Loads a model written by `save`
 
-class BaseTransform:
+        Args:
+            path (str): Model directory
+            mmap (bool, optional): Memory-map the arrays (read-only) instead
+                                    of reading them, so processes loading the
+                                    same model share its pages. 
+                                    Defaults to True.
+
+        Returns:
+            BaseModel: Model
+        """
+        with open(os.path.join(path, "manifest.json")) as file:
+            manifest = json.load(file)
+        assert manifest["version"] == MODEL_FORMAT_VERSION, f"Unsupported model format version {manifest['version']}."
+        model = _import_qualified(manifest["class"])(**manifest["params"])
+        arrays = dict()
+        for name, value in manifest["state"].items():
+            setattr(model, name, _load_value(value, path, mmap, arrays))
+        return model
+
+
+class BaseTransform(Instrumented):
+    _profiled_methods = ["fit", "transform", "fit_transform", "partial_fit"]
+    
     def __init__(self, name: str = "transform"):
         self.name = name
         
@@ -25,9 +25,23 @@ SOFTWARE.
 from mlpy import data
 from mlpy import regression
 from mlpy import metrics
+from mlpy import optimizers
+from mlpy import model_selection
+from mlpy import serving
+from mlpy import profiling
+from mlpy import bench
+from mlpy import preprocessing
+from mlpy import pipeline
 
 __all__ = [
     "data",
     "regression",
-    "metrics"
+    "metrics",
+    "optimizers",
+    "model_selection",
+    "serving",
+    "profiling",
+    "bench",
+    "preprocessing",
+    "pipeline"
 ]
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# native
+import sys
+import json
+import argparse
+
+# local
+from .benchmarks import BENCHMARKS
+from .runner import run_benchmarks, compare, save_report, load_report
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m mlpy.bench",
+                                     description="Runs the mlpy benchmarks and reports JSON to stdout")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=None,
+                        help="benchmarks to run (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10000, 100000], help="numbers of samples")
+    parser.add_argument("--features", nargs="+", type=int, default=[8, 32], help="numbers of features")
+    parser.add_argument("--repeat", type=int, default=3, help="timed calls per case")
+    parser.add_argument("--output", default=None, help="also write the report to this file")
+    parser.add_argument("--baseline", default=None, 
+                        help="saved report to compare against; exits with 1 on regressions")
+    parser.add_argument("--time-threshold", type=float, default=0.1, help="allowed relative time increase")
+    parser.add_argument("--memory-threshold", type=float, default=0.1, 
+                        help="allowed relative peak memory increase")
+    parser.add_argument("--quiet", action="store_true", help="do not print progress to stderr")
+    args = parser.parse_args(argv)
+    
+    report = run_benchmarks(args.benchmarks, args.sizes, args.features, args.repeat, verbose=not args.quiet)
+    if args.baseline is not None:
+        report["regressions"] = compare(load_report(args.baseline), report, 
+                                        args.time_threshold, args.memory_threshold)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['benchmark']} n={regression['n_samples']} "
+                  f"d={regression['n_features']} {regression['metric']}: {regression['baseline']:.4g} -> "
+                  f"{regression['current']:.4g} ({regression['change']:+.1%})", file=sys.stderr)
+    if args.output is not None:
+        save_report(report, args.output)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# site-packages
+import numpy as np
+
+# native
+import os
+
+# local
+from ..data.data_generator import LinearRegressionData
+from ..data.datasets import Dataset
+from ..regression import LinearRegressor, KnnRegressor, LIN_REG_SOLVERS
+from ..metrics import mse, rmse, mae, r2_score, RegressionMetrics
+
+
+# Every benchmark is a setup function (n_samples, n_features, directory) 
+# returning the zero argument callable that is measured. Setup is never 
+# timed, and the data only depends on the sizes, so runs are reproducible.
+
+BENCH_RANDOM_STATE = 0
+BENCH_KNN_QUERIES = 1000
+BENCH_ITERATIVE_PARAMS = {
+    "gradient_descent": {"max_iter": 20, "learning_rate": 1e-4},
+    "sgd": {"max_iter": 5, "learning_rate": 1e-5, "batch_size": 256},
+}
+
+
+def make_data(n_samples: int, n_features: int) -> tuple[np.ndarray, np.ndarray]:
+    return LinearRegressionData(n_samples, n_features, 5, random_state=BENCH_RANDOM_STATE).get_data()
+
+def bench_dataset_load(n_samples: int, n_features: int, directory: str):
+    X, y = make_data(n_samples, n_features)
+    path = os.path.join(directory, f"bench_{n_samples}_{n_features}.csv")
+    if not os.path.exists(path):
+        np.savetxt(path, np.hstack([X[:, 1:], y]), delimiter=",", 
+                   header=",".join([f"x{i}" for i in range(n_features)] + ["y"]), comments="")
+    return lambda: Dataset(path)
+
+def bench_data_generation(n_samples: int, n_features: int, directory: str):
+    datagen = LinearRegressionData(n_samples, n_features, 5, random_state=BENCH_RANDOM_STATE)
+    return datagen.get_data
+
+def make_bench_linear(solver: str):
+    def bench_linear(n_samples: int, n_features: int, directory: str):
+        X, y = make_data(n_samples, n_features)
+        params = BENCH_ITERATIVE_PARAMS.get(solver, {})
+        return lambda: LinearRegressor(solver, random_state=BENCH_RANDOM_STATE, **params).fit(X, y)
+    return bench_linear
+
+def bench_knn_predict(n_samples: int, n_features: int, directory: str):
+    X, y = make_data(n_samples + BENCH_KNN_QUERIES, n_features)
+    model = KnnRegressor(k=5)
+    model.fit(X[:n_samples], y[:n_samples])
+    return lambda: model.predict(X[n_samples:])
+
+def bench_metrics(n_samples: int, n_features: int, directory: str):
+    generator = np.random.default_rng(BENCH_RANDOM_STATE)
+    y_true = generator.standard_normal((n_samples, 1))
+    y_pred = y_true + generator.standard_normal((n_samples, 1))
+    def run():
+        for metric in [mse, rmse, mae, r2_score]:
+            metric(y_true, y_pred)
+        return RegressionMetrics().update(y_true, y_pred).result()
+    return run
+
+
+BENCHMARKS = {
+    "dataset_load": bench_dataset_load,
+    "data_generation": bench_data_generation,
+    **{f"linear_{solver}": make_bench_linear(solver) for solver in LIN_REG_SOLVERS},
+    "knn_predict": bench_knn_predict,
+    "metrics": bench_metrics,
+}
+
+# rows processed by one call, used for the throughput
+BENCH_ROWS = {"knn_predict": lambda n_samples: BENCH_KNN_QUERIES}
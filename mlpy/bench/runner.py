@@ -0,0 +1,170 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# site-packages
+import numpy as np
+
+# native
+import gc
+import os
+import sys
+import json
+import platform
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+# local
+from .benchmarks import BENCHMARKS, BENCH_ROWS
+
+
+BENCH_FORMAT_VERSION = 1
+
+
+def measure(function, repeat: int = 3) -> dict:
+    """Wall time of `repeat` calls plus the peak traced memory of one 
+    extra call. Memory is traced separately so tracing does not inflate
+    the timings.
+
+    Args:
+        function (callable): Zero argument callable
+        repeat (int, optional): Number of timed calls. Defaults to 3.
+
+    Returns:
+        dict: "time" (median seconds), "times" and "peak_memory" (MiB)
+    """
+    assert repeat > 0, f"The number of repetitions must be greater than 0. Got repeat = {repeat}."
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"time": float(np.median(times)), "times": times, "peak_memory": peak / 2**20}
+
+def environment() -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def run_benchmarks(names: list = None, 
+                   sizes: list = [10000, 100000], 
+                   features: list = [8, 32], 
+                   repeat: int = 3,
+                   directory: str = None,
+                   verbose: bool = False
+                  ) -> dict:
+    """Runs every benchmark over the grid of data sizes and feature counts
+
+    Args:
+        names (list, optional): Benchmarks to run. Defaults to all of BENCHMARKS.
+        sizes (list, optional): Numbers of samples. Defaults to [10000, 100000].
+        features (list, optional): Numbers of features. Defaults to [8, 32].
+        repeat (int, optional): Timed calls per case. Defaults to 3.
+        directory (str, optional): Where input files are written. 
+                                    Defaults to a temporary directory.
+        verbose (bool, optional): Print each result to stderr. Defaults to False.
+
+    Returns:
+        dict: Report with the "environment" and one "results" entry per case
+    """
+    names = list(BENCHMARKS) if names is None else names
+    for name in names:
+        assert name in BENCHMARKS, f"Unknown benchmark '{name}'. Options are {list(BENCHMARKS)}."
+    results = []
+    with tempfile.TemporaryDirectory() as temporary:
+        directory = temporary if directory is None else directory
+        for name in names:
+            for n_samples in sizes:
+                for n_features in features:
+                    function = BENCHMARKS[name](n_samples, n_features, directory)
+                    result = {"benchmark": name, "n_samples": n_samples, "n_features": n_features}
+                    result.update(measure(function, repeat))
+                    rows = BENCH_ROWS.get(name, lambda n: n)(n_samples)
+                    result["throughput"] = rows / result["time"] if result["time"] > 0 else float("inf")
+                    results.append(result)
+                    if verbose:
+                        print(format_result(result), file=sys.stderr)
+    return {"version": BENCH_FORMAT_VERSION, "environment": environment(), "results": results}
+
+def format_result(result: dict) -> str:
+    return (f"{result['benchmark']:24s} n={result['n_samples']:<8d} d={result['n_features']:<4d} | "
+            f"time: {result['time']:.4f}s | {result['throughput']:.3g} rows/s | "
+            f"peak memory: {result['peak_memory']:.1f} MiB")
+
+def compare(baseline: dict, current: dict, time_threshold: float = 0.1, memory_threshold: float = 0.1) -> list:
+    """Flags the cases of `current` that are slower or use more memory 
+    than the same case in `baseline` by more than the given fractions.
+    Cases missing from the baseline are ignored.
+
+    Args:
+        baseline (dict): Report returned by run_benchmarks
+        current (dict): Report returned by run_benchmarks
+        time_threshold (float, optional): Allowed relative time increase. 
+                                            Defaults to 0.1.
+        memory_threshold (float, optional): Allowed relative peak memory 
+                                            increase. Defaults to 0.1.
+
+    Returns:
+        list: One dict per regression with the case, "metric", "baseline",
+                "current" and relative "change"
+    """
+    key = lambda result: (result["benchmark"], result["n_samples"], result["n_features"])
+    reference = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        if key(result) not in reference:
+            continue
+        for metric, threshold in [("time", time_threshold), ("peak_memory", memory_threshold)]:
+            old, new = reference[key(result)][metric], result[metric]
+            change = (new - old) / old if old > 0 else 0.0
+            if change > threshold:
+                regressions.append({
+                    "benchmark": result["benchmark"], 
+                    "n_samples": result["n_samples"], 
+                    "n_features": result["n_features"],
+                    "metric": metric, 
+                    "baseline": old, 
+                    "current": new, 
+                    "change": change,
+                })
+    return regressions
+
+def save_report(report: dict, path: str):
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+        
+def load_report(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
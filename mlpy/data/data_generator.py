@@ -25,6 +25,10 @@ SOFTWARE.
 # site-packages
 import numpy as np
 
+# native
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 
 class NormalParamMeta:
     """Single normal distribution parameter metadata
@@ -40,7 +44,165 @@ class NormalParamMeta:
         self.std = std
 
 
-class LinearRegressionData:
+DATA_BLOCK_ROWS = 1 << 16
+
+
+class BlockDataGenerator:
+    """Base class of the synthetic data generators
+    
+    Rows are generated in blocks of `DATA_BLOCK_ROWS`, each drawn from its 
+    own random streams (children of a `SeedSequence` derived from 
+    `random_state`, keyed by block number), so the data does not depend on 
+    how it is requested: `get_data` with any number of workers and any 
+    `iter_batches` split return exactly the same rows.
+    
+    Subclasses draw their fixed parameters (weights, centers, ...) from 
+    `self.generator` in `__init__` and implement `_fill_rows`. The seed of 
+    the block streams is drawn from `self.generator` after them, when the
+    first rows are requested.
+    """
+    n_streams = 2
+    
+    def __init__(self, 
+                 n_samples: int, 
+                 n_features: int, 
+                 n_columns: int,
+                 random_state: int = None,
+                 dtype: np.dtype = np.float64,
+                 n_jobs: int = None
+                ):
+        """
+
+        Args:
+            n_samples (int): Number of samples
+            n_features (int): Number of features
+            n_columns (int): Number of columns of the predictors matrix
+            random_state (int, optional): Random seed. Defaults to None.
+            dtype (np.dtype, optional): Output type, np.float32 or 
+                                        np.float64. Defaults to np.float64.
+            n_jobs (int, optional): Number of threads filling blocks in 
+                                    `get_data`, -1 for all cores. 
+                                    Defaults to None (serial).
+        """
+        assert np.dtype(dtype) in [np.float32, np.float64], f"Unsupported dtype {dtype}. Use np.float32 or np.float64."
+        self.n_samples = n_samples
+        self.n_features = n_features
+        self.n_columns = n_columns
+        self.random_state = random_state
+        self.dtype = np.dtype(dtype)
+        self.n_jobs = n_jobs
+        self.generator = np.random.default_rng(self.random_state)
+        self.seed_sequence = None
+        
+    def get_data(self, out: tuple = None, mmap_path: str = None) -> tuple[np.ndarray, np.ndarray]:
+        """Returns predictors matrix and targets vector (in this order)
+        
+        The rows are written block by block straight into the output 
+        arrays, so no full-size temporaries are created. With `n_jobs`, 
+        disjoint blocks are filled concurrently by a thread pool.
+
+        Args:
+            out (tuple, optional): Preallocated (n_samples, n_columns)
+                                    predictors and (n_samples, 1) targets 
+                                    arrays to fill. Defaults to None.
+            mmap_path (str, optional): Write the data to memory-mapped 
+                                        `<mmap_path>_X.npy` and 
+                                        `<mmap_path>_y.npy` files instead of
+                                        memory. Defaults to None.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Predictors matrix, target vector
+        """
+        # drawn before any worker starts, so every block sees the same seed
+        self._seed_sequence()
+        X_shape = (self.n_samples, self.n_columns)
+        y_shape = (self.n_samples, 1)
+        if out is not None:
+            X, y = out
+            assert X.shape == X_shape and y.shape == y_shape, \
+                f"Expected output shapes {X_shape} and {y_shape}. Got {X.shape} and {y.shape}."
+        elif mmap_path is not None:
+            open_memmap = np.lib.format.open_memmap
+            X = open_memmap(f"{mmap_path}_X.npy", mode="w+", dtype=self.dtype, shape=X_shape)
+            y = open_memmap(f"{mmap_path}_y.npy", mode="w+", dtype=self.dtype, shape=y_shape)
+        else:
+            X = np.empty(X_shape, dtype=self.dtype)
+            y = np.empty(y_shape, dtype=self.dtype)
+        starts = range(0, self.n_samples, DATA_BLOCK_ROWS)
+        fill_block = lambda start: self._fill(X[start:start + DATA_BLOCK_ROWS], 
+                                              y[start:start + DATA_BLOCK_ROWS], start)
+        n_jobs = self.n_jobs or 1
+        if n_jobs < 0:
+            n_jobs = os.cpu_count()
+        if n_jobs == 1:
+            for start in starts:
+                fill_block(start)
+        else:
+            with ThreadPoolExecutor(n_jobs) as pool:
+                list(pool.map(fill_block, starts))
+        return X, y
+    
+    def iter_batches(self, batch_size: int):
+        """Generates the data in batches of rows, without ever holding the
+        whole dataset in memory. The random streams of a block are kept 
+        between consecutive batches, so every row is drawn once.
+
+        Args:
+            batch_size (int): Number of rows per batch
+
+        Yields:
+            tuple[np.ndarray, np.ndarray]: Predictors matrix, target vector
+        """
+        assert batch_size > 0, f"The batch size must be greater than 0. Got batch_size = {batch_size}."
+        streams = dict()
+        for start in range(0, self.n_samples, batch_size):
+            stop = min(start + batch_size, self.n_samples)
+            X = np.empty((stop - start, self.n_columns), dtype=self.dtype)
+            y = np.empty((stop - start, 1), dtype=self.dtype)
+            self._fill(X, y, start, streams)
+            yield X, y
+            
+    def _seed_sequence(self) -> np.random.SeedSequence:
+        if self.seed_sequence is None:
+            self.seed_sequence = np.random.SeedSequence(self.generator.integers(2**63))
+        return self.seed_sequence
+            
+    def _fill(self, X: np.ndarray, y: np.ndarray, start: int, streams: dict = None):
+        """Writes rows start, ..., start + len(X) - 1 into X and y. If given,
+        `streams` maps a block to its generators and the row they are at; 
+        it is updated so the next call can continue from there.
+        """
+        seed_sequence = self._seed_sequence()
+        pos = 0
+        while pos < len(X):
+            block, offset = divmod(start + pos, DATA_BLOCK_ROWS)
+            rows = min(len(X) - pos, DATA_BLOCK_ROWS - offset)
+            generators, position = (streams or dict()).get(block, (None, 0))
+            if generators is None or position != offset:
+                generators = [
+                    np.random.default_rng(np.random.SeedSequence(seed_sequence.entropy, 
+                                                                 spawn_key=(block, stream)))
+                    for stream in range(self.n_streams)
+                ]
+                if offset:
+                    # skip the rows of the block before `offset`
+                    self._fill_rows(np.empty((offset, self.n_columns), dtype=self.dtype), 
+                                    np.empty((offset, 1), dtype=self.dtype), generators)
+            self._fill_rows(X[pos:pos + rows], y[pos:pos + rows], generators)
+            if streams is not None:
+                streams.clear()
+                streams[block] = (generators, offset + rows)
+            pos += rows
+            
+    def _fill_rows(self, X: np.ndarray, y: np.ndarray, generators: list):
+        """Writes the next len(X) rows of a block into X and y, continuing 
+        the block streams in `generators`. Rows must be drawn in order, so 
+        that splitting a block into several calls gives the same rows.
+        """
+        raise NotImplementedError(f"Not available for {self.__class__}")
+
+
+class LinearRegressionData(BlockDataGenerator):
     """Data Generator for testing linear regressors
     
     First column is always a dummy variable (column of 1's)
@@ -52,7 +214,9 @@ class LinearRegressionData:
                  random_state: int = None,
                  val_range: list = [-25, 25],
                  weight_meta: NormalParamMeta = NormalParamMeta(),
-                 use_bias: bool = True
+                 use_bias: bool = True,
+                 dtype: np.dtype = np.float64,
+                 n_jobs: int = None
                 ):
         """
 
@@ -66,39 +230,44 @@ class LinearRegressionData:
             weight_meta (ParamMeta, optional): Weight metadata. 
                                                 Defaults to ParamMeta().
             use_bias (bool, optional): Use bias. Defaults to True.
+            dtype (np.dtype, optional): Output type, np.float32 or 
+                                        np.float64. Defaults to np.float64.
+            n_jobs (int, optional): Number of threads used by `get_data`.
+                                    Defaults to None.
         """
-        self.n_samples = n_samples
-        self.n_features = n_features
+        super().__init__(n_samples, n_features, n_features + 1, random_state, dtype, n_jobs)
         self.noise_std = noise_std
-        self.random_state = random_state
         self.val_range = val_range
         self.weight_meta = weight_meta
         self.use_bias = use_bias
-        
-        self.__generator = np.random.default_rng(self.random_state)
         self.__generate()
         
     def __generate(self):
-        self.__W = self.__generator.normal(
+        self.__W = self.generator.normal(
                     self.weight_meta.mean, 
                     self.weight_meta.std,
                     (self.n_features + 1, 1)
                  )
         self.__W[0] *= self.use_bias
-        
-    def get_data(self) -> tuple[np.ndarray, np.ndarray]:
-        """Returns predictors matrix and targets vector (in this order)
-
-        Returns:
-            tuple[np.ndarray, np.ndarray]: Predictors matrix, target vector
-        """
-        X_shape = (self.n_samples, self.n_features)
-        X = self.__generator.uniform(*self.val_range, X_shape)
-        dummy = np.ones((self.n_samples, 1))
-        self.__X = np.hstack([dummy, X])
-        eps = self.__generator.normal(0, self.noise_std, (self.n_samples, 1))
-        self.__y = self.__X @ self.__W + eps
-        return self.__X, self.__y
+            
+    def _fill_rows(self, X: np.ndarray, y: np.ndarray, generators: list):
+        X_generator, eps_generator = generators
+        rows = len(X)
+        low, high = self.val_range
+        values = X_generator.random((rows, self.n_features), dtype=self.dtype)
+        values *= high - low
+        values += low
+        X[:, 0] = 1
+        X[:, 1:] = values
+        eps = eps_generator.standard_normal((rows, 1), dtype=self.dtype)
+        eps *= self.noise_std
+        # column by column rather than a BLAS product, whose rounding 
+        # depends on the number of rows
+        W = self.__W.astype(self.dtype)
+        np.multiply(X[:, :1], W[0], out=y)
+        for column in range(1, self.n_columns):
+            y += X[:, column:column + 1] * W[column]
+        y += eps
     
     def get_weights(self) -> np.ndarray:
         """Returns ground truth weights
@@ -108,3 +277,96 @@ class LinearRegressionData:
         """
         return self.__W
     
+    
+class ClusteredRegressionData(BlockDataGenerator):
+    """Data Generator for testing nearest neighbors regressors
+    
+    Points are drawn around `n_clusters` Gaussian centers and the target is
+    a nonlinear function of the position (sum of sines) plus a per-cluster
+    offset, so only local models fit it well.
+    """
+    n_streams = 3
+    
+    def __init__(self, 
+                 n_samples: int, 
+                 n_features: int,
+                 n_clusters: int = 8,
+                 cluster_std: float = 1,
+                 noise_std: float = 0.1,
+                 random_state: int = None,
+                 center_range: list = [-10, 10],
+                 dtype: np.dtype = np.float64,
+                 n_jobs: int = None
+                ):
+        """
+
+        Args:
+            n_samples (int): Number of samples
+            n_features (int): Number of features
+            n_clusters (int, optional): Number of clusters. Defaults to 8.
+            cluster_std (float, optional): Standard deviation of the points
+                                            around their center. Defaults to 1.
+            noise_std (float, optional): Target noise. Defaults to 0.1.
+            random_state (int, optional): Random seed. Defaults to None.
+            center_range (list, optional): Range of the cluster centers. 
+                                            Defaults to [-10, 10].
+            dtype (np.dtype, optional): Output type. Defaults to np.float64.
+            n_jobs (int, optional): Number of threads used by `get_data`.
+                                    Defaults to None.
+        """
+        super().__init__(n_samples, n_features, n_features, random_state, dtype, n_jobs)
+        self.n_clusters = n_clusters
+        self.cluster_std = cluster_std
+        self.noise_std = noise_std
+        self.center_range = center_range
+        self.centers = self.generator.uniform(*center_range, (n_clusters, n_features))
+        self.offsets = self.generator.normal(0, 5, n_clusters)
+        
+    def _fill_rows(self, X: np.ndarray, y: np.ndarray, generators: list):
+        label_generator, X_generator, eps_generator = generators
+        rows = len(X)
+        labels = label_generator.integers(0, self.n_clusters, rows)
+        X[:] = X_generator.standard_normal((rows, self.n_features), dtype=self.dtype)
+        X *= self.cluster_std
+        X += self.centers[labels]
+        np.sum(np.sin(X), axis=1, keepdims=True, out=y)
+        y += self.offsets[labels, np.newaxis]
+        y += self.noise_std * eps_generator.standard_normal((rows, 1), dtype=self.dtype)
+        
+        
+class NonlinearRegressionData(BlockDataGenerator):
+    """Friedman #1 regression problem: features are uniform in [0, 1] and
+    y = 10 sin(pi x0 x1) + 20 (x2 - 0.5)^2 + 10 x3 + 5 x4 + noise. Features
+    beyond the fifth are irrelevant.
+    """
+    def __init__(self, 
+                 n_samples: int, 
+                 n_features: int = 10,
+                 noise_std: float = 1,
+                 random_state: int = None,
+                 dtype: np.dtype = np.float64,
+                 n_jobs: int = None
+                ):
+        """
+
+        Args:
+            n_samples (int): Number of samples
+            n_features (int, optional): Number of features (at least 5). 
+                                        Defaults to 10.
+            noise_std (float, optional): Target noise. Defaults to 1.
+            random_state (int, optional): Random seed. Defaults to None.
+            dtype (np.dtype, optional): Output type. Defaults to np.float64.
+            n_jobs (int, optional): Number of threads used by `get_data`.
+                                    Defaults to None.
+        """
+        assert n_features >= 5, f"The number of features must be at least 5. Got n_features = {n_features}."
+        super().__init__(n_samples, n_features, n_features, random_state, dtype, n_jobs)
+        self.noise_std = noise_std
+        
+    def _fill_rows(self, X: np.ndarray, y: np.ndarray, generators: list):
+        X_generator, eps_generator = generators
+        rows = len(X)
+        X[:] = X_generator.random((rows, self.n_features), dtype=self.dtype)
+        y[:, 0] = 10 * np.sin(np.pi * X[:, 0] * X[:, 1]) + 20 * (X[:, 2] - 0.5)**2 \
+                    + 10 * X[:, 3] + 5 * X[:, 4]
+        y += self.noise_std * eps_generator.standard_normal((rows, 1), dtype=self.dtype)
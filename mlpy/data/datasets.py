@@ -27,49 +27,191 @@ import numpy as np
 from prettytable import PrettyTable
 
 # native
+import os
 import re
-from copy import deepcopy
+import json
+import hashlib
+from copy import copy
+from concurrent.futures import ProcessPoolExecutor
+
+
+FLOAT_PATTERN = re.compile("[-+]? (?: (?: \d* \. \d+ ) " \
+                    + "| (?: \d+ \.? ) )(?: [Ee] [+-]? \d+ ) ?", re.VERBOSE)
+BOOL_VALUES = {"True": 1, "False": 0}
+CSV_CHUNK_BYTES = 1 << 22
+CSV_SAMPLE_ROWS = 1000
+CACHE_VERSION = 1
+CACHE_FINGERPRINT_BYTES = 1 << 20
 
 
 class Dataset:
     """Loader for csv datasets
+    
+    Columns are stored as typed NumPy arrays. The dtype of each column is 
+    inferred from the first rows of the file (int64 for digits and 
+    True/False, float64 for other numbers, object otherwise) and promoted 
+    if a later value does not fit.
     """
-    def __init__(self, path: str):
+    def __init__(self, path: str, lazy: bool = False, cache: bool = False, n_jobs: int = None):
         """
 
         Args:
             path (str): Path to dataset
+            lazy (bool, optional): Only read the header and infer the column
+                                    types, leaving the rows to be streamed
+                                    with `iter_chunks`. Defaults to False.
+            cache (bool, optional): Keep a binary copy of the parsed columns
+                                    in a sidecar directory next to the csv
+                                    file and memory-map it on later loads.
+                                    The cache is rebuilt whenever the csv
+                                    file changes. Defaults to False.
+            n_jobs (int, optional): Number of worker processes parsing the 
+                                    file (-1 for all cores). The file is 
+                                    split into byte ranges on the same line
+                                    boundaries as the serial reader, so the
+                                    result is identical. Defaults to None 
+                                    (serial).
         """
-        self.data = self.__parse_csv(path)
+        self.path = path
+        self.n_jobs = n_jobs
+        self.header = []
+        self.dtypes = dict()
+        self.__bool_columns = set()
+        if lazy:
+            self.data = {column: None for column in self.__read_schema(path)}
+        elif cache:
+            self.data = self.__load_cache(path)
+            if self.data is None:
+                self.data = self.__parse_csv(path)
+                self.__write_cache(path)
+        else:
+            self.data = self.__parse_csv(path)
+     
+    @property
+    def data(self) -> dict:
+        """Dictionary mapping each column to its values, with any pending
+        row permutation applied
+        """
+        for column in list(self.__pending):
+            self.__materialize(column)
+        return self.__columns
+    
+    @data.setter
+    def data(self, data: dict):
+        self.__columns = data
+        self.__pending = dict()
      
     def __str__(self) -> str:
         table = PrettyTable()
         for column in self.header:
-            table.add_column(column, self.data[column])
+            table.add_column(column, np.asarray(self[column]).tolist())
         return table.get_string()
     
+    def __len__(self) -> int:
+        if not self.header:
+            return 0
+        column = self.header[0]
+        values = self.__pending.get(column, self.__columns[column])
+        return 0 if values is None else len(values)
+    
     def __getitem__(self, item):
-         return self.data[item]
+        """Returns a column by name. A slice of rows or a list of column 
+        names returns a new Dataset sharing memory with this one.
+        """
+        if isinstance(item, slice):
+            return self.__view(self.header, item)
+        if isinstance(item, list):
+            return self.__view(item, slice(None))
+        if item in self.__pending:
+            self.__materialize(item)
+        return self.__columns[item]
      
     def __setitem__(self, name, item):
-         self.data[name] = item
+        self.__pending.pop(name, None)
+        self.__columns[name] = item
          
     def sort_by_column(self, column_name: str):
         """Sorts values in the data based on the values in a given column.
         Operation is performed in-place.
+        
+        Only the sorting column is reordered right away; the permutation is
+        recorded for the other columns and applied when they are accessed.
 
         Args:
             column_name (str): Column name
         """
-        idxs = np.argsort(self[column_name])
+        idxs = np.argsort(self[column_name], kind="stable")
         for column in self.header:
-            self.data[column] = list(np.array(self.data[column])[idxs])
+            if column in self.__pending:
+                self.__pending[column] = self.__pending[column][idxs]
+            else:
+                self.__pending[column] = idxs
+        self.__materialize(column_name)
             
     def head(self, number_of_lines: int):
-        head = deepcopy(self)
-        for column in head.header:
-            head[column] = head[column][:number_of_lines]
-        return head
+        """Returns the first rows as a new Dataset. Columns without a 
+        pending permutation are views of this dataset's arrays.
+
+        Args:
+            number_of_lines (int): Number of rows
+
+        Returns:
+            Dataset: First rows
+        """
+        return self[:number_of_lines]
+    
+    def to_numpy(self, columns: list = None, dtype: np.dtype = np.float64) -> np.ndarray:
+        """Stacks columns into a C-contiguous (n_rows, n_columns) matrix, 
+        ready to be used as `X_train` by the regressors
+
+        Args:
+            columns (list, optional): Column names. Defaults to all columns.
+            dtype (np.dtype, optional): Output type. Defaults to np.float64.
+
+        Returns:
+            np.ndarray: Feature matrix
+        """
+        columns = self.header if columns is None else columns
+        matrix = np.empty((len(self), len(columns)), dtype=dtype)
+        for i, column in enumerate(columns):
+            values = self.__columns[column]
+            if column in self.__pending:
+                values = np.take(values, self.__pending[column])
+            matrix[:, i] = values
+        return matrix
+    
+    def __materialize(self, column: str):
+        order = self.__pending.pop(column)
+        self.__columns[column] = np.asarray(self.__columns[column])[order]
+        
+    def __view(self, columns: list, rows: slice):
+        view = copy(self)
+        view.header = list(columns)
+        view.dtypes = {column: self.dtypes[column] for column in columns}
+        view.data = {
+            column: np.asarray(self.__columns[column])[rows] for column in columns
+            if column not in self.__pending
+        }
+        for column in columns:
+            if column in self.__pending:
+                view.__pending[column] = self.__pending[column][rows]
+                view.__columns[column] = self.__columns[column]
+        return view
+    
+    def iter_chunks(self, rows: int = 65536):
+        """Streams the csv file in blocks of rows, so files larger than the
+        available memory can be processed
+
+        Args:
+            rows (int, optional): Number of rows per chunk. Defaults to 65536.
+
+        Yields:
+            dict: Dictionary mapping each column to a typed array with up to
+                    `rows` values
+        """
+        assert rows > 0, f"The number of rows must be greater than 0. Got rows = {rows}."
+        for lines in self.__iter_lines(self.path, rows):
+            yield self.__parse_lines(lines)
        
     def __parse_csv(self, path: str) -> dict:
         """Parse csv file
@@ -80,44 +222,313 @@ class Dataset:
         Returns:
             dict: Dictionary containing data
         """
-        file = open(path)
+        self.__read_schema(path)
+        n_jobs = self.n_jobs or 1
+        if n_jobs < 0:
+            n_jobs = os.cpu_count()
+        chunks = self.__parse_parallel(path, n_jobs) if n_jobs > 1 else None
+        if chunks is None:
+            chunks = [self.__parse_lines(lines) for lines in self.__iter_lines(path)]
         data = dict()
-        header = [i.strip("\"") for i in file.readline().strip("\n").split(",")]
-        for i in header:
-            data[i] = []
-        self.header = header
-        while True:
-            line = file.readline()
-            if line == "":
-                break
-            line = self.__parse_line(line)
-            for i, column in enumerate(header):
-                data[column].append(line[i])
+        for column in self.header:
+            dtype = self.dtypes[column]
+            arrays = [chunk.pop(column).astype(dtype) for chunk in chunks if column in chunk]
+            data[column] = np.concatenate(arrays) if arrays else np.empty(0, dtype)
         return data
-            
-    def __parse_line(self, line: str) -> list:
-        """Parses a line from csv file converting strings into the 
-        appropriate format
+    
+    def __parse_parallel(self, path: str, n_jobs: int) -> list:
+        """Parses the byte ranges of the file in worker processes
 
         Args:
-            line (str): Line of csv file
+            path (str): Path to csv file
+            n_jobs (int): Number of workers
 
         Returns:
-            list: parsed line
+            list: Parsed chunks in file order, or None if the file should 
+                    be parsed serially
         """
-        rfloat = re.compile("[-+]? (?: (?: \d* \. \d+ ) " \
-                    + "| (?: \d+ \.? ) )(?: [Ee] [+-]? \d+ ) ?", re.VERBOSE)
-        line = [i for i in line.strip("\n").split(",")]
-        line_parsed = []
-        for substring in line:
-            if bool(rfloat.match(substring)):
-                if substring.isdigit():
-                    value = int(substring)
-                else:
-                    value = float(substring)
-            elif substring in ["True", "False"]:
-                value = int(eval(substring))
+        ranges = self.__byte_ranges(path, n_jobs)
+        if len(ranges) < 2:
+            return None
+        with ProcessPoolExecutor(len(ranges)) as pool:
+            results = list(pool.map(self._parse_range, [path] * len(ranges), ranges))
+        chunks = []
+        for worker_chunks, bool_columns in results:
+            chunks.extend(worker_chunks)
+            self.__bool_columns |= bool_columns
+        # every worker starts from the sampled types, so the column types 
+        # are promoted again in file order and each chunk is cast to the 
+        # type the serial parser would have used for it
+        for column in self.header:
+            dtype = self.dtypes[column]
+            for chunk in chunks:
+                if column not in chunk:
+                    continue
+                if dtype == object and chunk[column].dtype.kind == "f":
+                    # the serial parser would have kept whole numbers of 
+                    # this chunk as int objects
+                    self.__read_schema(path)
+                    return None
+                dtype = self.__promote(dtype, chunk[column].dtype)
+                chunk[column] = chunk[column].astype(dtype, copy=False)
+            self.dtypes[column] = dtype
+        return chunks
+    
+    def _parse_range(self, path: str, byte_range: tuple) -> tuple[list, set]:
+        """Worker side of the parallel parser
+
+        Args:
+            path (str): Path to csv file
+            byte_range (tuple): (start, stop) offsets returned by `__byte_ranges`
+
+        Returns:
+            tuple[list, set]: Parsed chunks and the columns found to hold 
+                                True/False values
+        """
+        chunks = [self.__parse_lines(lines) for lines in self.__iter_lines(path, byte_range=byte_range)]
+        return chunks, self.__bool_columns
+    
+    def __byte_ranges(self, path: str, n_jobs: int) -> list:
+        """Splits the rows of the file into up to `n_jobs` byte ranges with
+        the same number of `CSV_CHUNK_BYTES` chunks, cut at the chunk
+        boundaries of the serial reader
+        """
+        size = os.path.getsize(path)
+        with open(path, "rb") as file:
+            origin = len(file.readline())
+            n_chunks = -(-(size - origin) // CSV_CHUNK_BYTES)
+            n_ranges = max(1, min(n_jobs, n_chunks))
+            boundaries = [origin]
+            for i in range(1, n_ranges):
+                end = origin + (i * n_chunks // n_ranges) * CSV_CHUNK_BYTES
+                boundaries.append(self.__chunk_boundary(file, origin, end))
+            boundaries.append(size)
+        return [(start, stop) for start, stop in zip(boundaries[:-1], boundaries[1:]) if stop > start]
+    
+    @staticmethod
+    def __chunk_boundary(file, origin: int, end: int) -> int:
+        """Offset right after the last line break before `end`"""
+        position = end
+        while position > origin:
+            start = max(origin, position - CSV_CHUNK_BYTES)
+            file.seek(start)
+            cut = file.read(position - start).rfind(b"\n")
+            if cut >= 0:
+                return start + cut + 1
+            position = start
+        return origin
+    
+    @staticmethod
+    def cache_path(path: str) -> str:
+        """Returns the sidecar directory used to cache a csv file
+
+        Args:
+            path (str): Path to csv file
+
+        Returns:
+            str: Path to cache directory
+        """
+        return path + ".cache"
+    
+    @staticmethod
+    def __source_stamp(path: str) -> dict:
+        """Size, modification time and a hash of the first and last 
+        `CACHE_FINGERPRINT_BYTES` of the file, cheap enough to check on
+        every load
+        """
+        stat = os.stat(path)
+        digest = hashlib.sha1()
+        with open(path, "rb") as file:
+            digest.update(file.read(CACHE_FINGERPRINT_BYTES))
+            if stat.st_size > CACHE_FINGERPRINT_BYTES:
+                file.seek(max(CACHE_FINGERPRINT_BYTES, stat.st_size - CACHE_FINGERPRINT_BYTES))
+                digest.update(file.read())
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": digest.hexdigest()}
+    
+    def __load_cache(self, path: str) -> dict:
+        """Memory-maps the cached columns of a csv file
+
+        Args:
+            path (str): Path to csv file
+
+        Returns:
+            dict: Dictionary containing data, or None if there is no valid
+                    cache for the current file
+        """
+        cache_dir = self.cache_path(path)
+        try:
+            with open(os.path.join(cache_dir, "manifest.json")) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != CACHE_VERSION \
+                or manifest.get("source") != self.__source_stamp(path):
+            return None
+        data = dict()
+        for column, dtype, filename in zip(manifest["header"], manifest["dtypes"], manifest["files"]):
+            mmap_mode = None if dtype == "object" else "r"
+            data[column] = np.load(os.path.join(cache_dir, filename), 
+                                   mmap_mode=mmap_mode, allow_pickle=mmap_mode is None)
+            self.dtypes[column] = np.dtype(dtype)
+        self.header = manifest["header"]
+        return data
+    
+    def __write_cache(self, path: str):
+        """Writes one .npy file per column and a manifest to the cache 
+        directory. Every file is written under a temporary name and renamed,
+        with the manifest last, so concurrent readers never see a partial
+        cache.
+
+        Args:
+            path (str): Path to csv file
+        """
+        cache_dir = self.cache_path(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+        files = []
+        for i, column in enumerate(self.header):
+            filename = f"column_{i}.npy"
+            with open(os.path.join(cache_dir, filename + suffix), "wb") as file:
+                np.save(file, self.data[column], allow_pickle=self.dtypes[column] == object)
+            os.replace(os.path.join(cache_dir, filename + suffix), os.path.join(cache_dir, filename))
+            files.append(filename)
+        manifest = {
+            "version": CACHE_VERSION,
+            "header": self.header,
+            "dtypes": [self.dtypes[column].name for column in self.header],
+            "files": files,
+            "source": self.__source_stamp(path)
+        }
+        with open(os.path.join(cache_dir, "manifest.json" + suffix), "w") as file:
+            json.dump(manifest, file)
+        os.replace(os.path.join(cache_dir, "manifest.json" + suffix), 
+                   os.path.join(cache_dir, "manifest.json"))
+    
+    def __read_schema(self, path: str) -> list:
+        """Reads the header and infers the type of each column from the
+        first `CSV_SAMPLE_ROWS` rows
+
+        Args:
+            path (str): Path to csv file
+
+        Returns:
+            list: Header
+        """
+        with open(path) as file:
+            header = [i.strip("\"") for i in file.readline().strip("\n").split(",")]
+            sample = []
+            for line in file:
+                if len(sample) == CSV_SAMPLE_ROWS:
+                    break
+                if line.strip("\n"):
+                    sample.append(line.strip("\n").split(","))
+        self.header = header
+        self.dtypes = dict()
+        self.__bool_columns = set()
+        for i, column in enumerate(header):
+            self.dtypes[column] = self.__infer_dtype([line[i] for line in sample], column)
+        return header
+    
+    def __iter_lines(self, path: str, rows: int = None, byte_range: tuple = None):
+        """Reads the rows after the header in byte chunks of 
+        `CSV_CHUNK_BYTES`, yielding lists of lines. If `rows` is given, the
+        lines are regrouped into lists of exactly `rows` lines (except for
+        the last one). With `byte_range` only the rows between two offsets 
+        returned by `__byte_ranges` are read, in the same chunks as a read
+        of the whole file.
+        """
+        with open(path, "rb") as file:
+            origin = len(file.readline())
+            position, stop = (origin, None) if byte_range is None else byte_range
+            file.seek(position)
+            remainder = b""
+            pending = []
+            while True:
+                end = origin + ((position - origin) // CSV_CHUNK_BYTES + 1) * CSV_CHUNK_BYTES
+                chunk = file.read((end if stop is None else min(end, stop)) - position)
+                if not chunk:
+                    break
+                position += len(chunk)
+                chunk = remainder + chunk
+                cut = chunk.rfind(b"\n") + 1
+                remainder = chunk[cut:]
+                lines = [line for line in chunk[:cut].decode().split("\n") if line]
+                if rows is None:
+                    yield lines
+                    continue
+                pending.extend(lines)
+                while len(pending) >= rows:
+                    yield pending[:rows]
+                    pending = pending[rows:]
+            if remainder:
+                pending.append(remainder.decode())
+            if rows is None and pending:
+                yield pending
+            elif rows is not None:
+                for start in range(0, len(pending), rows):
+                    yield pending[start:start + rows]
+    
+    def __parse_lines(self, lines: list) -> dict:
+        """Converts a block of lines into one typed array per column,
+        promoting the column type if a value does not fit
+
+        Args:
+            lines (list): Lines of csv file
+
+        Returns:
+            dict: Dictionary mapping each column to a typed array
+        """
+        n_columns = len(self.header)
+        tokens = ",".join(lines).split(",")
+        if len(tokens) == len(lines) * n_columns:
+            columns = [tokens[i::n_columns] for i in range(n_columns)]
+        else:
+            columns = zip(*[line.split(",") for line in lines])
+        parsed = dict()
+        for column, values in zip(self.header, columns):
+            dtype = self.dtypes[column]
+            if dtype != object:
+                converted = values
+                if column in self.__bool_columns:
+                    converted = [BOOL_VALUES.get(value, value) for value in values]
+                try:
+                    parsed[column] = np.array(converted, dtype=dtype)
+                    continue
+                except ValueError:
+                    dtype = self.__promote(dtype, self.__infer_dtype(values, column))
+                    self.dtypes[column] = dtype
+            if dtype == object:
+                array = np.empty(len(values), dtype=object)
+                array[:] = [self.__parse_value(value) for value in values]
+            else:
+                array = np.array([self.__parse_value(value) for value in values], dtype=dtype)
+            parsed[column] = array
+        return parsed
+    
+    def __infer_dtype(self, substrings: list, column: str) -> np.dtype:
+        if any(substring in BOOL_VALUES for substring in substrings):
+            self.__bool_columns.add(column)
+        kinds = {type(self.__parse_value(substring)) for substring in substrings}
+        if str in kinds:
+            return np.dtype(object)
+        if float in kinds:
+            return np.dtype(np.float64)
+        return np.dtype(np.int64)
+    
+    @staticmethod
+    def __promote(dtype: np.dtype, other: np.dtype) -> np.dtype:
+        if object in (dtype, other):
+            return np.dtype(object)
+        return np.promote_types(dtype, other)
+            
+    def __parse_value(self, substring: str):
+        if bool(FLOAT_PATTERN.match(substring)):
+            if substring.isdigit():
+                value = int(substring)
             else:
-                value = substring
-            line_parsed.append(value)
-        return line_parsed
\ No newline at end of file
+                value = float(substring)
+        elif substring in BOOL_VALUES:
+            value = BOOL_VALUES[substring]
+        else:
+            value = substring
+        return value
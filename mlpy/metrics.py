@@ -26,17 +26,113 @@ SOFTWARE.
 import numpy as np
 
 
+# residuals are taken in float64 so lower precision predictions are
+# accumulated without losing digits in the sums
 def mse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
-    return np.mean(np.subtract(y_true, y_pred)**2)
+    return np.mean(np.subtract(y_true, y_pred, dtype=np.float64)**2)
 
 def rmse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
-    return np.sqrt(np.mean(np.subtract(y_true, y_pred)**2))
+    return np.sqrt(np.mean(np.subtract(y_true, y_pred, dtype=np.float64)**2))
 
 def mae(y_true: np.ndarray, y_pred: np.ndarray) -> float:
-    return np.mean(np.abs(np.subtract(y_true, y_pred)))
+    return np.mean(np.abs(np.subtract(y_true, y_pred, dtype=np.float64)))
 
 def r2_score(y_true: np.ndarray, y_pred: np.ndarray) -> float:
-    ssr = np.sum(np.subtract(y_true, y_pred)**2)
-    ym = np.mean(y_true)
-    ssm = np.sum(np.subtract(y_true, ym)**2)
-    return 1 - (ssr / ssm)
\ No newline at end of file
+    ssr = np.sum(np.subtract(y_true, y_pred, dtype=np.float64)**2)
+    ym = np.mean(y_true, dtype=np.float64)
+    ssm = np.sum(np.subtract(y_true, ym, dtype=np.float64)**2)
+    return 1 - (ssr / ssm)
+
+def knn_recall(exact_neighbors: np.ndarray, approx_neighbors: np.ndarray) -> float:
+    hits = approx_neighbors[:, :, np.newaxis] == exact_neighbors[:, np.newaxis, :]
+    return np.mean(np.sum(np.any(hits, axis=2), axis=1) / exact_neighbors.shape[1])
+
+
+class RegressionMetrics:
+    """Single-pass accumulator of mse, rmse, mae and r2_score
+    
+    Chunks of predictions are folded in with `update` and partial results
+    computed on different shards are combined with `merge`, so the metrics
+    of data that never fits in memory at once can be computed exactly. The
+    target variance needed by r2_score is accumulated with Chan's parallel
+    update of the (weighted) mean and sum of squared deviations, which is
+    numerically stable. Multi-output targets get one value per column.
+    """
+    def __init__(self):
+        self.weight_sum = 0.0
+        self.sse = 0.0
+        self.sae = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray, sample_weight: np.ndarray = None):
+        """Adds a chunk of targets and predictions
+
+        Args:
+            y_true (np.ndarray): (n,) or (n, T) targets
+            y_pred (np.ndarray): Predictions with the same shape
+            sample_weight (np.ndarray, optional): (n,) weights. Defaults to None.
+
+        Returns:
+            RegressionMetrics: self
+        """
+        if len(y_true) == 0:
+            return self
+        y_true = np.asarray(y_true).reshape(len(y_true), -1)
+        y_pred = np.asarray(y_pred).reshape(len(y_pred), -1)
+        other = RegressionMetrics()
+        residual = np.subtract(y_true, y_pred, dtype=np.float64)
+        if sample_weight is None:
+            other.weight_sum = float(len(y_true))
+            other.mean = y_true.mean(0, dtype=np.float64)
+            other.sse = np.einsum("ij,ij->j", residual, residual)
+            other.sae = np.abs(residual).sum(0)
+            deviation = y_true - other.mean
+            other.m2 = np.einsum("ij,ij->j", deviation, deviation)
+        else:
+            w = np.asarray(sample_weight, dtype=np.float64).reshape(-1)
+            other.weight_sum = w.sum()
+            other.mean = w @ y_true / other.weight_sum
+            other.sse = w @ residual**2
+            other.sae = w @ np.abs(residual)
+            other.m2 = w @ (y_true - other.mean)**2
+        return self.merge(other)
+    
+    def merge(self, other: "RegressionMetrics"):
+        """Combines the statistics of another accumulator into this one
+
+        Args:
+            other (RegressionMetrics): Accumulator over a disjoint set of rows
+
+        Returns:
+            RegressionMetrics: self
+        """
+        total = self.weight_sum + other.weight_sum
+        if other.weight_sum == 0:
+            return self
+        delta = other.mean - self.mean
+        self.m2 = self.m2 + other.m2 + delta**2 * self.weight_sum * other.weight_sum / total
+        self.mean = self.mean + delta * other.weight_sum / total
+        self.sse = self.sse + other.sse
+        self.sae = self.sae + other.sae
+        self.weight_sum = total
+        return self
+    
+    def result(self) -> dict:
+        """Returns the metrics of all the rows seen so far
+
+        Returns:
+            dict: "mse", "rmse", "mae" and "r2_score", as floats for single
+                    output targets or arrays with one value per output
+        """
+        assert self.weight_sum > 0, "No data has been added yet!"
+        mse_ = np.asarray(self.sse / self.weight_sum)
+        results = {
+            "mse": mse_,
+            "rmse": np.sqrt(mse_),
+            "mae": np.asarray(self.sae / self.weight_sum),
+            "r2_score": 1 - np.asarray(self.sse) / self.m2,
+        }
+        for name, value in results.items():
+            results[name] = float(value[0]) if value.size == 1 else value
+        return results
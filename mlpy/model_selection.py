@@ -0,0 +1,238 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# site-packages
+import numpy as np
+
+# native
+import os
+import itertools
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# local
+from .metrics import mse
+from .regression import KnnRegressor
+
+
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+class KFold:
+    """K-fold cross-validation splitter
+    
+    Only index arrays are produced; the data is sliced by the caller.
+    """
+    def __init__(self, n_splits: int = 5, shuffle: bool = False, random_state: int = 0):
+        """
+
+        Args:
+            n_splits (int, optional): Number of folds. Defaults to 5.
+            shuffle (bool, optional): Shuffle rows before splitting. 
+                                        Defaults to False.
+            random_state (int, optional): Random seed for shuffling. 
+                                            Defaults to 0.
+        """
+        assert n_splits > 1, f"The number of splits must be greater than 1. Got n_splits = {n_splits}."
+        self.n_splits = n_splits
+        self.shuffle = shuffle
+        self.random_state = random_state
+        
+    def split(self, n_samples: int):
+        """Yields the train and test indices of every fold
+
+        Args:
+            n_samples (int): Number of rows
+
+        Yields:
+            tuple[np.ndarray, np.ndarray]: Train indices, test indices
+        """
+        assert n_samples >= self.n_splits, f"Cannot split {n_samples} rows into {self.n_splits} folds."
+        idxs = np.arange(n_samples)
+        if self.shuffle:
+            idxs = np.random.default_rng(self.random_state).permutation(n_samples)
+        bounds = np.linspace(0, n_samples, self.n_splits + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            yield np.concatenate([idxs[:start], idxs[stop:]]), idxs[start:stop]
+            
+            
+def _evaluate(model_class: type, 
+              candidates: list, 
+              X: np.ndarray, 
+              y: np.ndarray, 
+              train_idx: np.ndarray, 
+              test_idx: np.ndarray, 
+              scoring
+             ) -> list:
+    """Scores a group of candidates on one fold. For KnnRegressor groups 
+    (candidates only differing by k) the neighbor search runs once for the
+    largest k and is truncated for the others.
+    """
+    X_train, y_train = X[train_idx], y[train_idx]
+    X_test, y_test = X[test_idx], y[test_idx]
+    if issubclass(model_class, KnnRegressor):
+        ks = [model_class(**params).k for params in candidates]
+        model = model_class(**{**candidates[0], "k": max(ks)})
+        model.fit(X_train, y_train)
+        neighbors = model.kneighbors(X_test)
+        return [scoring(y_test, model.predict_from_neighbors(neighbors[:, :k])) for k in ks]
+    scores = []
+    for params in candidates:
+        model = model_class(**params)
+        model.fit(X_train, y_train)
+        scores.append(scoring(y_test, model.predict(X_test)))
+    return scores
+
+
+class GridSearch:
+    """Exhaustive search over a grid of hyperparameters with cross-validation
+    
+    Folds x candidates are evaluated concurrently by a thread or process 
+    pool. The lowest mean score wins, so `scoring` must be an error metric 
+    such as `mlpy.metrics.mse`.
+    """
+    def __init__(self, 
+                 model_class: type,
+                 param_grid: dict,
+                 cv: KFold = None,
+                 scoring = mse,
+                 n_jobs: int = None,
+                 backend: str = "thread",
+                 refit: bool = True
+                ):
+        """
+
+        Args:
+            model_class (type): BaseModel subclass
+            param_grid (dict): Lists of values for each constructor argument
+            cv (KFold, optional): Splitter. Defaults to KFold().
+            scoring (callable, optional): Error metric. Defaults to mse.
+            n_jobs (int, optional): Number of workers, -1 for all cores. 
+                                        Defaults to None (serial).
+            backend (str, optional): "thread" or "process". Defaults to "thread".
+            refit (bool, optional): Fit the best candidate on the whole data.
+                                        Defaults to True.
+        """
+        assert backend in EXECUTORS, f"Unknown backend '{backend}'. Options are {list(EXECUTORS)}."
+        self.model_class = model_class
+        self.param_grid = param_grid
+        self.cv = KFold() if cv is None else cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.backend = backend
+        self.refit = refit
+        self.results = []
+        self.best_params = None
+        self.best_score = None
+        self.best_model = None
+        
+    def candidates(self) -> list:
+        keys = list(self.param_grid)
+        return [dict(zip(keys, values)) for values in itertools.product(*self.param_grid.values())]
+    
+    def fit(self, X: np.ndarray, y: np.ndarray):
+        candidates = self.candidates()
+        groups = self.__group(candidates)
+        folds = list(self.cv.split(len(X)))
+        tasks = [(group, fold) for group in groups for fold in range(len(folds))]
+        args = [
+            (self.model_class, [candidates[i] for i in group], X, y, *folds[fold], self.scoring)
+            for group, fold in tasks
+        ]
+        n_jobs = self.n_jobs or 1
+        if n_jobs < 0:
+            n_jobs = os.cpu_count()
+        if n_jobs == 1:
+            outputs = [_evaluate(*arg) for arg in args]
+        else:
+            with EXECUTORS[self.backend](n_jobs) as pool:
+                outputs = list(pool.map(_evaluate, *zip(*args)))
+        scores = np.zeros((len(candidates), len(folds)))
+        for (group, fold), output in zip(tasks, outputs):
+            scores[group, fold] = output
+        self.results = [
+            {"params": params, "scores": scores[i], "mean_score": scores[i].mean(), 
+             "std_score": scores[i].std()}
+            for i, params in enumerate(candidates)
+        ]
+        best = int(np.argmin(scores.mean(1)))
+        self.best_params = candidates[best]
+        self.best_score = scores[best].mean()
+        if self.refit:
+            self.best_model = self.model_class(**self.best_params)
+            self.best_model.fit(X, y)
+        return self
+    
+    def __group(self, candidates: list) -> list:
+        """Groups candidates that can share work on a fold: KnnRegressor 
+        candidates with the same parameters except for k
+        """
+        if not issubclass(self.model_class, KnnRegressor):
+            return [[i] for i in range(len(candidates))]
+        groups = dict()
+        for i, params in enumerate(candidates):
+            key = tuple(sorted((name, repr(value)) for name, value in params.items() if name != "k"))
+            groups.setdefault(key, []).append(i)
+        return list(groups.values())
+    
+    
+class RandomSearch(GridSearch):
+    """Random search over hyperparameter distributions with cross-validation
+    """
+    def __init__(self, 
+                 model_class: type,
+                 param_distributions: dict,
+                 n_iter: int = 10,
+                 random_state: int = 0,
+                 cv: KFold = None,
+                 scoring = mse,
+                 n_jobs: int = None,
+                 backend: str = "thread",
+                 refit: bool = True
+                ):
+        """
+
+        Args:
+            model_class (type): BaseModel subclass
+            param_distributions (dict): For each constructor argument, a list
+                                            of values to pick uniformly from or
+                                            a callable taking a np.random.Generator
+            n_iter (int, optional): Number of candidates. Defaults to 10.
+            random_state (int, optional): Random seed. Defaults to 0.
+        """
+        super().__init__(model_class, param_distributions, cv, scoring, n_jobs, backend, refit)
+        self.n_iter = n_iter
+        self.random_state = random_state
+        
+    def candidates(self) -> list:
+        generator = np.random.default_rng(self.random_state)
+        candidates = []
+        for _ in range(self.n_iter):
+            params = dict()
+            for name, values in self.param_grid.items():
+                if callable(values):
+                    params[name] = values(generator)
+                else:
+                    params[name] = values[generator.integers(len(values))]
+            candidates.append(params)
+        return candidates
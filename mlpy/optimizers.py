@@ -0,0 +1,170 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# site-packages
+import numpy as np
+
+
+OPTIMIZERS = ["sgd", "adam"]
+LR_SCHEDULES = ["constant", "inverse_scaling", "exponential"]
+
+
+class Optimizer:
+    """First order optimizer updating a parameter array in place
+    
+    State buffers are allocated once in `reset` and reused by every `step`,
+    so an optimization loop performs no per-step allocation.
+    """
+    def __init__(self, 
+                 learning_rate: float = 1e-3,
+                 schedule: str = "constant",
+                 decay: float = 0.5
+                ):
+        """
+
+        Args:
+            learning_rate (float, optional): Initial learning rate. 
+                                                Defaults to 1e-3.
+            schedule (str, optional): Learning rate schedule over epochs:
+                                        "constant", "inverse_scaling" 
+                                        (lr / (epoch + 1)^decay) or 
+                                        "exponential" (lr * decay^epoch).
+                                        Defaults to "constant".
+            decay (float, optional): Schedule decay. Defaults to 0.5.
+        """
+        assert schedule in LR_SCHEDULES, f"Unknown schedule '{schedule}'. Options are {LR_SCHEDULES}."
+        self.learning_rate = learning_rate
+        self.schedule = schedule
+        self.decay = decay
+        self.current_learning_rate = learning_rate
+        self.buffer = None
+        
+    def reset(self, shape: tuple, dtype: np.dtype = np.float64):
+        """Allocates the state buffers for parameters of a given shape
+
+        Args:
+            shape (tuple): Parameter shape
+            dtype (np.dtype, optional): Parameter type. Defaults to np.float64.
+        """
+        self.current_learning_rate = self.learning_rate
+        self.buffer = np.zeros(shape, dtype=dtype)
+        
+    def set_epoch(self, epoch: int):
+        """Updates the learning rate according to the schedule
+
+        Args:
+            epoch (int): Epoch number, starting at 0
+        """
+        if self.schedule == "inverse_scaling":
+            self.current_learning_rate = self.learning_rate / (epoch + 1)**self.decay
+        elif self.schedule == "exponential":
+            self.current_learning_rate = self.learning_rate * self.decay**epoch
+        
+    def step(self, params: np.ndarray, grad: np.ndarray):
+        raise NotImplementedError(f"Not available for {self.__class__}")
+    
+    
+class SGD(Optimizer):
+    """Stochastic gradient descent with optional (heavy ball) momentum
+    """
+    def __init__(self, 
+                 learning_rate: float = 1e-3,
+                 momentum: float = 0,
+                 schedule: str = "constant",
+                 decay: float = 0.5
+                ):
+        super().__init__(learning_rate, schedule, decay)
+        self.momentum = momentum
+        self.velocity = None
+        
+    def reset(self, shape: tuple, dtype: np.dtype = np.float64):
+        super().reset(shape, dtype)
+        self.velocity = np.zeros(shape, dtype=dtype) if self.momentum else None
+        
+    def step(self, params: np.ndarray, grad: np.ndarray):
+        np.multiply(grad, self.current_learning_rate, out=self.buffer)
+        if self.velocity is None:
+            params -= self.buffer
+            return
+        self.velocity *= self.momentum
+        self.velocity -= self.buffer
+        params += self.velocity
+        
+        
+class Adam(Optimizer):
+    """Adam: adaptive moment estimation
+    """
+    def __init__(self, 
+                 learning_rate: float = 1e-3,
+                 beta1: float = 0.9,
+                 beta2: float = 0.999,
+                 eps: float = 1e-8,
+                 schedule: str = "constant",
+                 decay: float = 0.5
+                ):
+        super().__init__(learning_rate, schedule, decay)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+        self.m = None
+        self.v = None
+        self.t = 0
+        
+    def reset(self, shape: tuple, dtype: np.dtype = np.float64):
+        super().reset(shape, dtype)
+        self.m = np.zeros(shape, dtype=dtype)
+        self.v = np.zeros(shape, dtype=dtype)
+        self.t = 0
+        
+    def step(self, params: np.ndarray, grad: np.ndarray):
+        self.t += 1
+        self.m *= self.beta1
+        np.multiply(grad, 1 - self.beta1, out=self.buffer)
+        self.m += self.buffer
+        self.v *= self.beta2
+        np.multiply(grad, grad, out=self.buffer)
+        self.buffer *= 1 - self.beta2
+        self.v += self.buffer
+        step_size = self.current_learning_rate * np.sqrt(1 - self.beta2**self.t) / (1 - self.beta1**self.t)
+        np.sqrt(self.v, out=self.buffer)
+        self.buffer += self.eps
+        np.divide(self.m, self.buffer, out=self.buffer)
+        self.buffer *= step_size
+        params -= self.buffer
+        
+        
+def get_optimizer(name: str, learning_rate: float = 1e-3, **kwargs) -> Optimizer:
+    """Builds an optimizer by name
+
+    Args:
+        name (str): One of OPTIMIZERS
+        learning_rate (float, optional): Learning rate. Defaults to 1e-3.
+
+    Returns:
+        Optimizer: Optimizer
+    """
+    assert name in OPTIMIZERS, f"Unknown optimizer '{name}'. Options are {OPTIMIZERS}."
+    if name == "sgd":
+        return SGD(learning_rate, **kwargs)
+    return Adam(learning_rate, **kwargs)
@@ -0,0 +1,180 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# site-packages
+import numpy as np
+
+# local
+from .__common import BaseModel
+from .preprocessing import AffineTransform
+from .regression import LinearRegressor
+
+
+class Pipeline(BaseModel):
+    """Chain of transforms followed by a model
+    
+    Inputs are pushed through the transforms `block_size` rows at a time. 
+    Every step writes into a block buffer that is reused for all blocks, 
+    and affine steps after the first work in place, so only the transformed
+    training matrix handed to `model.fit` (and the predictions) have the 
+    size of the input. 
+    
+    With `fold` and a LinearRegressor model whose transforms are all 
+    affine, the transforms are folded into the weights after fitting and
+    `predict` calls the model directly on raw inputs. The constant term of
+    the folding goes into a column that was constant in the training data
+    (e.g. the dummy bias column of LinearRegressionData).
+    
+    The block buffers are shared by all calls, so an unfolded pipeline 
+    should not predict from several threads at once.
+    """
+    _transient_attributes = ["_Pipeline__buffers"]
+    
+    def __init__(self, 
+                 steps: list = None, 
+                 model: BaseModel = None, 
+                 name: str = "pipeline",
+                 block_size: int = 65536,
+                 fold: bool = False
+                ):
+        """
+
+        Args:
+            steps (list, optional): Transforms applied in order. Defaults to None.
+            model (BaseModel, optional): Model fitted on the transformed 
+                                            data. Defaults to None.
+            name (str, optional): Pipeline name. Defaults to "pipeline".
+            block_size (int, optional): Rows per block. Defaults to 65536.
+            fold (bool, optional): Fold affine transforms into the weights
+                                    of a LinearRegressor. Defaults to False.
+        """
+        assert block_size > 0, f"The block size must be greater than 0. Got block_size = {block_size}."
+        super().__init__(name)
+        self.steps = [] if steps is None else steps
+        self.model = model
+        self.block_size = block_size
+        self.fold = fold
+        self.folded = False
+        self.__buffers = dict()
+        
+    def fit(self, X_train: np.ndarray, y_train: np.ndarray):
+        """Fits each transform with `partial_fit` over blocks of the output
+        of the previous ones, then the model on the transformed data
+
+        Args:
+            X_train (np.ndarray): (n, d) matrix
+            y_train (np.ndarray): Targets
+        """
+        assert self.model is not None, "The pipeline has no model!"
+        assert not self.fold or self.__can_fold(), "Only affine transforms can be folded into a LinearRegressor."
+        self.folded = False
+        for i, step in enumerate(self.steps):
+            for start in range(0, len(X_train), self.block_size):
+                block = self.__apply(X_train[start:start + self.block_size], self.steps[:i])
+                if start == 0:
+                    step.fit(block)
+                else:
+                    step.partial_fit(block)
+        self.model.fit(self.transform(X_train), y_train)
+        if self.fold:
+            self.__fold()
+        return self
+        
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """Applies the transforms only
+
+        Args:
+            X (np.ndarray): (n, d) matrix
+
+        Returns:
+            np.ndarray: Transformed matrix
+        """
+        if not self.steps:
+            return X
+        out = None
+        for start in range(0, len(X), self.block_size):
+            block = self.__apply(X[start:start + self.block_size], self.steps)
+            if out is None:
+                out = np.empty((len(X),) + block.shape[1:], dtype=block.dtype)
+            out[start:start + len(block)] = block
+        return np.empty((0,) + X.shape[1:]) if out is None else out
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self.folded or not self.steps:
+            return self.model.predict(X)
+        out = None
+        for start in range(0, len(X), self.block_size):
+            y_pred = self.model.predict(self.__apply(X[start:start + self.block_size], self.steps))
+            if out is None:
+                out = np.empty((len(X),) + y_pred.shape[1:], dtype=y_pred.dtype)
+            out[start:start + len(y_pred)] = y_pred
+        return out
+    
+    def predict_one(self, x: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        if self.folded or not self.steps:
+            return self.model.predict_one(x, out)
+        return self.model.predict_one(self.__apply(x[np.newaxis, :], self.steps)[0], out)
+    
+    def __apply(self, X: np.ndarray, steps: list) -> np.ndarray:
+        """Runs a block through `steps`, writing into the reused buffers"""
+        current = X
+        for i, step in enumerate(steps):
+            if isinstance(step, AffineTransform) and current is not X:
+                current = step.transform(current, copy=False)
+                continue
+            buffer = self.__buffers.get(i)
+            if buffer is None or len(buffer) < len(current):
+                copy = {"copy": True} if isinstance(step, AffineTransform) else {}
+                current = self.__buffers[i] = step.transform(current, **copy)
+            else:
+                current = step.transform(current, out=buffer[:len(current)])
+        return current
+    
+    def __can_fold(self) -> bool:
+        return isinstance(self.model, LinearRegressor) \
+            and all(isinstance(step, AffineTransform) for step in self.steps)
+    
+    def __fold(self):
+        """Rewrites the weights W fitted on X * m + o as m * W, adding the
+        constant o @ W through a constant column of X
+        """
+        if not self.steps:
+            return
+        multiplier, offset = 1.0, 0.0
+        for step in self.steps:
+            multiplier = multiplier * step.multiplier
+            offset = offset * step.multiplier + step.offset
+        weights = self.model.weights.astype(np.float64)
+        intercept = offset @ weights
+        constant_ids, constant_values = self.steps[0].constant_columns()
+        nonzero = np.flatnonzero(constant_values)
+        assert np.allclose(intercept, 0) or len(nonzero), \
+            "Folding needs a constant nonzero column (e.g. a bias column) in the training data."
+        # (d,) weights of a 1-D target or (d, T) weights
+        weights *= multiplier.reshape((-1,) + (1,) * (weights.ndim - 1))
+        if len(nonzero):
+            column = constant_ids[nonzero[0]]
+            weights[column] += intercept / constant_values[nonzero[0]]
+        self.model.weights = weights.astype(self.model.weights.dtype, copy=False)
+        self.folded = True
@@ -0,0 +1,271 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# site-packages
+import numpy as np
+
+# native
+import itertools
+
+# local
+from .__common import BaseTransform
+
+
+class AffineTransform(BaseTransform):
+    """Base of the transforms computing X * multiplier + offset per column
+    
+    Subclasses accumulate their statistics chunk by chunk in `_update_stats`
+    and derive the per-column coefficients in `_affine`. Columns that were
+    constant in every chunk seen (such as the dummy bias column of 
+    LinearRegressionData) are passed through unchanged.
+    """
+    def __init__(self, name: str = "affine_transform", copy: bool = True):
+        """
+
+        Args:
+            name (str, optional): Transform name. Defaults to "affine_transform".
+            copy (bool, optional): Return a new array from `transform`; if 
+                                    False floating point inputs are 
+                                    overwritten in place. Defaults to True.
+        """
+        super().__init__(name)
+        self.copy = copy
+        self.reset()
+        
+    def reset(self):
+        self.n_samples_seen = 0
+        self.data_min = None
+        self.data_max = None
+        self.multiplier = None
+        self.offset = None
+        
+    def fit(self, X: np.ndarray):
+        self.reset()
+        return self.partial_fit(X)
+    
+    def partial_fit(self, X: np.ndarray):
+        """Updates the statistics with a chunk of rows
+
+        Args:
+            X (np.ndarray): (n, d) chunk
+
+        Returns:
+            AffineTransform: self
+        """
+        X = np.asarray(X)
+        if len(X) == 0:
+            return self
+        if self.data_min is None:
+            self.data_min, self.data_max = X.min(0), X.max(0)
+        else:
+            assert X.shape[1] == len(self.data_min), f"Expected {len(self.data_min)} features, got {X.shape[1]}."
+            self.data_min = np.minimum(self.data_min, X.min(0))
+            self.data_max = np.maximum(self.data_max, X.max(0))
+        self._update_stats(X)
+        self.n_samples_seen += len(X)
+        multiplier, offset = self._affine()
+        constant = self.data_min == self.data_max
+        multiplier[constant] = 1
+        offset[constant] = 0
+        self.multiplier, self.offset = multiplier, offset
+        return self
+    
+    def transform(self, X: np.ndarray, copy: bool = None, out: np.ndarray = None) -> np.ndarray:
+        """Applies the transform
+
+        Args:
+            X (np.ndarray): (n, d) matrix
+            copy (bool, optional): Overrides `self.copy`. Defaults to None.
+            out (np.ndarray, optional): (n, d) output buffer, may be X. 
+                                        Defaults to None.
+
+        Returns:
+            np.ndarray: Transformed matrix
+        """
+        assert self.multiplier is not None, "Transform has not been fitted yet!"
+        copy = self.copy if copy is None else copy
+        if out is None and not copy:
+            assert np.issubdtype(X.dtype, np.floating), "Only floating point arrays can be transformed in place."
+            out = X
+        elif out is None:
+            out = np.empty(X.shape, dtype=X.dtype if np.issubdtype(X.dtype, np.floating) else np.float64)
+        np.multiply(X, self.multiplier, out=out)
+        out += self.offset
+        return out
+    
+    def fit_transform(self, X: np.ndarray, copy: bool = None, out: np.ndarray = None) -> np.ndarray:
+        return self.fit(X).transform(X, copy, out)
+    
+    def constant_columns(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the indices and values of the columns that were constant"""
+        ids = np.flatnonzero(self.data_min == self.data_max)
+        return ids, self.data_min[ids]
+    
+    def _update_stats(self, X: np.ndarray):
+        pass
+    
+    def _affine(self) -> tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError(f"Not available for {self.__class__}")
+
+
+class StandardScaler(AffineTransform):
+    """Scales every column to zero mean and unit variance
+    
+    The mean and variance are merged across chunks with Chan's parallel 
+    update, which stays accurate when the mean is large compared to the 
+    spread.
+    """
+    def __init__(self, 
+                 name: str = "standard_scaler", 
+                 with_mean: bool = True, 
+                 with_std: bool = True, 
+                 copy: bool = True
+                ):
+        self.with_mean = with_mean
+        self.with_std = with_std
+        super().__init__(name, copy)
+        
+    def reset(self):
+        super().reset()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.var = None
+        
+    def _update_stats(self, X: np.ndarray):
+        n = len(X)
+        mean = X.mean(0, dtype=np.float64)
+        deviation = X - mean
+        m2 = np.einsum("ij,ij->j", deviation, deviation)
+        total = self.n_samples_seen + n
+        delta = mean - self.mean
+        self.m2 = self.m2 + m2 + delta**2 * self.n_samples_seen * n / total
+        self.mean = self.mean + delta * n / total
+        self.var = self.m2 / total
+        
+    def _affine(self) -> tuple[np.ndarray, np.ndarray]:
+        std = np.sqrt(self.var)
+        multiplier = 1 / np.where(std > 0, std, 1) if self.with_std else np.ones_like(std)
+        offset = -self.mean * multiplier if self.with_mean else np.zeros_like(std)
+        return multiplier, offset
+
+
+class MinMaxScaler(AffineTransform):
+    """Scales every column linearly onto `feature_range`"""
+    def __init__(self, name: str = "min_max_scaler", feature_range: tuple = (0, 1), copy: bool = True):
+        assert feature_range[0] < feature_range[1], f"Invalid feature range: {feature_range}."
+        self.feature_range = feature_range
+        super().__init__(name, copy)
+        
+    def _affine(self) -> tuple[np.ndarray, np.ndarray]:
+        low, high = self.feature_range
+        data_range = (self.data_max - self.data_min).astype(np.float64)
+        multiplier = (high - low) / np.where(data_range > 0, data_range, 1)
+        offset = low - self.data_min * multiplier
+        return multiplier, offset
+
+
+class PolynomialFeatures(BaseTransform):
+    """Products of the input columns up to a given degree
+    
+    Output columns are ordered by degree. Each column of degree > 1 is 
+    computed as one column of the previous degree times an input column. 
+    Columns sharing the lower degree column use a contiguous range of input
+    columns, so every such run is one broadcast multiplication written 
+    straight into the output.
+    """
+    def __init__(self, 
+                 name: str = "polynomial_features", 
+                 degree: int = 2, 
+                 interaction_only: bool = False, 
+                 include_bias: bool = False
+                ):
+        """
+
+        Args:
+            name (str, optional): Transform name. Defaults to "polynomial_features".
+            degree (int, optional): Maximum degree. Defaults to 2.
+            interaction_only (bool, optional): Only products of distinct 
+                                                columns. Defaults to False.
+            include_bias (bool, optional): Prepend a column of 1's. 
+                                            Defaults to False.
+        """
+        assert degree > 0, f"The degree must be greater than 0. Got degree = {degree}."
+        super().__init__(name)
+        self.degree = degree
+        self.interaction_only = interaction_only
+        self.include_bias = include_bias
+        self.n_features = None
+        self.n_output_features = None
+        self.runs = None
+        
+    def fit(self, X: np.ndarray):
+        self.n_features = X.shape[1]
+        combine = itertools.combinations if self.interaction_only else itertools.combinations_with_replacement
+        offset = int(self.include_bias)
+        columns = {(i,): offset + i for i in range(self.n_features)}
+        # (parent column, first factor, last factor + 1, first output column)
+        runs = []
+        for degree in range(2, self.degree + 1):
+            for combination in combine(range(self.n_features), degree):
+                parent = columns[combination[:-1]]
+                column = columns[combination] = offset + len(columns)
+                if runs and runs[-1][0] == parent:
+                    runs[-1][2] += 1
+                else:
+                    runs.append([parent, combination[-1], combination[-1] + 1, column])
+        self.runs = np.array(runs, dtype=np.intp).reshape(-1, 4)
+        self.n_output_features = offset + len(columns)
+        return self
+    
+    def partial_fit(self, X: np.ndarray):
+        if self.n_features is None:
+            return self.fit(X)
+        assert X.shape[1] == self.n_features, f"Expected {self.n_features} features, got {X.shape[1]}."
+        return self
+    
+    def transform(self, X: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """Computes the polynomial features
+
+        Args:
+            X (np.ndarray): (n, d) matrix
+            out (np.ndarray, optional): (n, n_output_features) output buffer.
+                                        Defaults to None.
+
+        Returns:
+            np.ndarray: (n, n_output_features) matrix
+        """
+        assert self.n_features is not None, "Transform has not been fitted yet!"
+        if out is None:
+            dtype = X.dtype if np.issubdtype(X.dtype, np.floating) else np.float64
+            out = np.empty((len(X), self.n_output_features), dtype=dtype)
+        offset = int(self.include_bias)
+        if self.include_bias:
+            out[:, 0] = 1
+        out[:, offset:offset + self.n_features] = X
+        for parent, start, stop, column in self.runs:
+            np.multiply(out[:, parent:parent + 1], X[:, start:stop], out=out[:, column:column + stop - start])
+        return out
+    
+    def fit_transform(self, X: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        return self.fit(X).transform(X, out)
@@ -0,0 +1,202 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# native
+import json
+import threading
+import functools
+from time import perf_counter
+
+
+class Sink:
+    """Destination of profiling records. A record is a flat dict with the
+    "model" name, the "event" and event specific fields such as "time" 
+    (seconds), "rows" and "rows_per_second".
+    """
+    def write(self, record: dict):
+        raise NotImplementedError(f"Not available for {self.__class__}")
+    
+    def close(self):
+        pass
+
+
+class MemorySink(Sink):
+    """Aggregates the records in memory per event"""
+    def __init__(self, keep_records: bool = False):
+        """
+
+        Args:
+            keep_records (bool, optional): Also keep every record in 
+                                            `records`. Defaults to False.
+        """
+        self.keep_records = keep_records
+        self.records = []
+        self.stats = dict()
+        
+    def write(self, record: dict):
+        if self.keep_records:
+            self.records.append(record)
+        stats = self.stats.get(record["event"])
+        if stats is None:
+            stats = self.stats[record["event"]] = {
+                "count": 0, "total_time": 0.0, "min_time": float("inf"), "max_time": 0.0, "rows": 0
+            }
+        stats["count"] += 1
+        if "time" in record:
+            stats["total_time"] += record["time"]
+            stats["min_time"] = min(stats["min_time"], record["time"])
+            stats["max_time"] = max(stats["max_time"], record["time"])
+        stats["rows"] += record.get("rows") or 0
+        
+    def summary(self) -> dict:
+        """Returns the aggregated stats of every event
+
+        Returns:
+            dict: Per event "count", "total_time", "mean_time", "min_time",
+                    "max_time", "rows" and "rows_per_second"
+        """
+        summary = dict()
+        for event, stats in self.stats.items():
+            total_time = stats["total_time"]
+            summary[event] = dict(stats, 
+                                  mean_time=total_time / stats["count"],
+                                  rows_per_second=stats["rows"] / total_time if total_time > 0 else 0.0)
+        return summary
+    
+    def clear(self):
+        self.records = []
+        self.stats = dict()
+
+
+class JsonLinesSink(Sink):
+    """Appends every record as a line of JSON to a file"""
+    def __init__(self, path: str):
+        self.path = path
+        self.__file = None
+        
+    def write(self, record: dict):
+        if self.__file is None:
+            self.__file = open(self.path, "a")
+        self.__file.write(json.dumps(record, default=float) + "\n")
+        
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+class CallbackSink(Sink):
+    """Calls a function with every record"""
+    def __init__(self, callback):
+        self.callback = callback
+        
+    def write(self, record: dict):
+        self.callback(record)
+
+
+class Span:
+    """Times a block of code and writes a single record when it exits.
+    Extra fields (e.g. the loss of an iteration) can be attached with `set`.
+    """
+    __slots__ = ["profiler", "event", "rows", "fields", "start"]
+    
+    def __init__(self, profiler: "Profiler", event: str, rows: int = None, fields: dict = None):
+        self.profiler = profiler
+        self.event = event
+        self.rows = rows
+        self.fields = fields or dict()
+        self.start = None
+        
+    def set(self, **fields):
+        self.fields.update(fields)
+        
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        elapsed = perf_counter() - self.start
+        fields = {"time": elapsed}
+        if self.rows is not None:
+            fields["rows"] = self.rows
+            fields["rows_per_second"] = self.rows / elapsed if elapsed > 0 else 0.0
+        fields.update(self.fields)
+        self.profiler.record(self.event, **fields)
+
+
+class _NullSpan:
+    """Shared span used while profiling is disabled, does nothing"""
+    __slots__ = []
+    
+    def set(self, **fields):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """Sends timing records of one model to a list of sinks. Records may
+    come from several threads (e.g. sharded neighbor searches), writes to
+    the sinks are serialized by a lock.
+    """
+    def __init__(self, name: str, sinks: list):
+        self.name = name
+        self.sinks = sinks
+        self.__lock = threading.Lock()
+        
+    def span(self, event: str, rows: int = None, **fields) -> Span:
+        return Span(self, event, rows, fields)
+    
+    def record(self, event: str, **fields):
+        record = {"model": self.name, "event": event}
+        record.update(fields)
+        with self.__lock:
+            for sink in self.sinks:
+                sink.write(record)
+                
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def timed(profiler: Profiler, event: str, method):
+    """Wraps a bound method into one recording a span per call. The rows
+    of a call are the length of its first argument, or 1 for a single 
+    (d,) row.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        rows = None
+        if args and hasattr(args[0], "ndim"):
+            rows = len(args[0]) if args[0].ndim > 1 else 1
+        with Span(profiler, event, rows):
+            return method(*args, **kwargs)
+    return wrapper
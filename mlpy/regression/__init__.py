@@ -23,4 +23,5 @@ SOFTWARE.
 """
 
 from .linear_regression import *
-from .nearest_neighbors import *
\ No newline at end of file
+from .nearest_neighbors import *
+from .prototypes import *
\ No newline at end of file
@@ -27,12 +27,18 @@ import numpy as np
 
 # local
 from ..__common import BaseModel
+from ..optimizers import OPTIMIZERS, get_optimizer
 
 
-LIN_REG_SOLVERS = ["pinv", "gradient_descent", "sgd"]
+LIN_REG_SOLVERS = ["pinv", "gradient_descent", "sgd", "incremental", 
+                   "cholesky", "qr", "lstsq", "auto"]
+LIN_REG_CHOLESKY_MAX_COND = 1e8
+LIN_REG_QR_MAX_COND = 1e14
 
 
 class LinearRegressor(BaseModel):
+    _transient_attributes = ["_LinearRegressor__predict_cache"]
+    
     def __init__(self, 
                  solver: str = "pinv", 
                  name: str = "linear_regressor", 
@@ -40,8 +46,52 @@ class LinearRegressor(BaseModel):
                  learning_rate: float = 1e-3,
                  batch_size: int = 32,
                  random_state: int = 0,
+                 chunk_size: int = 65536,
+                 optimizer: str = "sgd",
+                 momentum: float = 0,
+                 lr_schedule: str = "constant",
+                 tol: float = 1e-4,
+                 n_iter_no_change: int = 20,
+                 dtype: np.dtype = None,
                 ):
+        """
+
+        Args:
+            solver (str, optional): One of LIN_REG_SOLVERS. Defaults to "pinv".
+            name (str, optional): Model name. Defaults to "linear_regressor".
+            max_iter (int, optional): Maximum number of epochs of the 
+                                        iterative solvers. An epoch is one 
+                                        full-batch step for "gradient_descent"
+                                        and one pass over all the shuffled 
+                                        mini-batches for "sgd", i.e. about 
+                                        N / batch_size steps (older versions 
+                                        counted single mini-batch steps). 
+                                        Defaults to 1000.
+            learning_rate (float, optional): Initial step size. Defaults to 1e-3.
+            batch_size (int, optional): Rows per "sgd" mini-batch. Defaults to 32.
+            random_state (int, optional): Seed of the initial weights and of
+                                            the batch shuffling. Defaults to 0.
+            chunk_size (int, optional): Rows per chunk of the "incremental"
+                                        solver and of the float64 normal 
+                                        equations. Defaults to 65536.
+            optimizer (str, optional): One of OPTIMIZERS. Defaults to "sgd".
+            momentum (float, optional): Momentum of the "sgd" optimizer. 
+                                        Defaults to 0.
+            lr_schedule (str, optional): Learning rate schedule over the 
+                                            epochs. Defaults to "constant".
+            tol (float, optional): Early stopping is on by default: the 
+                                    iterative solvers stop once the epoch loss
+                                    has not improved by at least `tol` for 
+                                    `n_iter_no_change` consecutive epochs. 
+                                    None runs all `max_iter` epochs, as older
+                                    versions did. Defaults to 1e-4.
+            n_iter_no_change (int, optional): Epochs without improvement 
+                                                before stopping. Defaults to 20.
+            dtype (np.dtype, optional): Model dtype, np.float32 or np.float64.
+                                        Defaults to None (the dtype of X).
+        """
         assert solver in LIN_REG_SOLVERS, f"Unknown solver '{solver}'. Options are {LIN_REG_SOLVERS}."
+        assert optimizer in OPTIMIZERS, f"Unknown optimizer '{optimizer}'. Options are {OPTIMIZERS}."
         self.solver = solver
         self.name = name
         super().__init__(name)
@@ -50,38 +100,274 @@ class LinearRegressor(BaseModel):
         self.learning_rate = learning_rate
         self.batch_size = batch_size
         self.random_state = random_state
+        self.chunk_size = chunk_size
+        self.optimizer = optimizer
+        self.momentum = momentum
+        self.lr_schedule = lr_schedule
+        self.tol = tol
+        self.n_iter_no_change = n_iter_no_change
+        self.dtype = dtype
+        self.loss_history = []
+        self.n_iter = 0
         self.__generator = np.random.default_rng(self.random_state)
+        self.__R = None
+        self.__qty = None
+        self.__predict_cache = None
         
     def fit(self, X_train: np.ndarray, y_train: np.ndarray):
+        # iterative solvers run in the model dtype; closed form solvers 
+        # accumulate and factorize in float64 and only store the weights 
+        # in the model dtype
+        dtype = self.__resolve_dtype(X_train)
+        X_train = X_train.astype(dtype, copy=False)
+        y_train = y_train.astype(dtype, copy=False)
+        # a fit starts over, dropping the rows of earlier partial_fit calls
+        self.__R = None
+        self.__qty = None
         if self.solver == "pinv":
             self.__solve_pinv(X_train, y_train)
         elif self.solver == "gradient_descent":
             self.__solve_gradient_descent(X_train, y_train)
-        else:
+        elif self.solver == "sgd":
             self.__solve_sgd(X_train, y_train)
+        elif self.solver == "incremental":
+            self.__solve_incremental(X_train, y_train)
+        elif self.solver == "cholesky":
+            self.__solve_cholesky(X_train, y_train)
+        elif self.solver == "qr":
+            self.__solve_qr(X_train, y_train)
+        elif self.solver == "lstsq":
+            self.__solve_lstsq(X_train, y_train)
+        else:
+            self.__solve_auto(X_train, y_train)
+        self.weights = self.weights.astype(dtype, copy=False)
+            
+    def fit_batched(self, X_train: np.ndarray, y_train: np.ndarray):
+        """Fits B independent regressions stacked along the first axis in a 
+        few vectorized calls. The weights become a (B, d, T) array and 
+        `predict` returns one (n, T) prediction per model.
+        
+        The "pinv" and "lstsq" solvers use a batched pseudoinverse of X; all
+        other solvers solve the (B, d, d) normal equations at once, falling
+        back to their pseudoinverse if any of the systems is singular.
+
+        Args:
+            X_train (np.ndarray): (B, n, d) predictors matrices
+            y_train (np.ndarray): (B, n) or (B, n, T) targets
+        """
+        assert X_train.ndim == 3, f"Expected a (B, n, d) predictors array. Got shape {X_train.shape}."
+        dtype = self.__resolve_dtype(X_train)
+        self.__R = None
+        self.__qty = None
+        X_train = X_train.astype(np.float64, copy=False)
+        y_train = y_train.reshape(*X_train.shape[:2], -1).astype(np.float64, copy=False)
+        if self.solver in ["pinv", "lstsq"]:
+            self.weights = (np.linalg.pinv(X_train) @ y_train).astype(dtype, copy=False)
+            return
+        X_t = X_train.transpose(0, 2, 1)
+        gram = X_t @ X_train
+        moment = X_t @ y_train
+        try:
+            self.weights = np.linalg.solve(gram, moment)
+        except np.linalg.LinAlgError:
+            self.weights = np.linalg.pinv(gram, hermitian=True) @ moment
+        self.weights = self.weights.astype(dtype, copy=False)
+            
+    def partial_fit(self, X_chunk: np.ndarray, y_chunk: np.ndarray):
+        """Updates the least squares solution with a new chunk of rows, so
+        data that does not fit in memory can be streamed through the model.
+        
+        Keeps the R factor of the QR decomposition of all rows seen so far
+        and Q^T y: each chunk is stacked below R and refactored, which costs
+        O((n_chunk + d) d^2) and is numerically as stable as a full QR.
+        The weights are the minimum norm solution pinv(R) Q^T y, equal to 
+        the "pinv" solver on the concatenated data, with (d,) weights for a
+        1-D target chunk and (d, T) weights otherwise.
+
+        Args:
+            X_chunk (np.ndarray): Chunk of the predictors matrix
+            y_chunk (np.ndarray): Chunk of the targets vector
+        """
+        dtype = self.__resolve_dtype(X_chunk)
+        target_shape = (-1,) if y_chunk.ndim == 1 else (X_chunk.shape[1], -1)
+        X_chunk = X_chunk.astype(np.float64, copy=False)
+        y_chunk = y_chunk.reshape(len(y_chunk), -1).astype(np.float64, copy=False)
+        if self.__R is not None:
+            X_chunk = np.vstack([self.__R, X_chunk])
+            y_chunk = np.vstack([self.__qty, y_chunk])
+        Q, self.__R = np.linalg.qr(X_chunk)
+        self.__qty = Q.T @ y_chunk
+        weights = np.linalg.pinv(self.__R) @ self.__qty
+        self.weights = weights.reshape(target_shape).astype(dtype, copy=False)
             
     def predict(self, X: np.ndarray) -> np.ndarray:
-        assert type(self.weights) == np.ndarray, "Model has not been trained yet!"
+        assert isinstance(self.weights, np.ndarray), "Model has not been trained yet!"
         return X @ self.weights
+    
+    def predict_one(self, x: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """Low-latency prediction of a single (d,) row. The model is 
+        validated and the output buffer allocated on the first call after 
+        each fit; later calls do not allocate. 
+        
+        Without `out`, the returned array is an internal buffer overwritten 
+        by the next call.
+
+        Args:
+            x (np.ndarray): (d,) row
+            out (np.ndarray, optional): (T,) output buffer, () if the model 
+                                        was fit on a 1-D target. Defaults to None.
+
+        Returns:
+            np.ndarray: (T,) prediction, () for a 1-D target
+        """
+        cache = self.__predict_cache
+        if cache is None or cache[0] is not self.weights:
+            assert isinstance(self.weights, np.ndarray), "Model has not been trained yet!"
+            # () for (d,) weights, (T,) for (d, T) weights
+            shape = np.shape(x @ self.weights)
+            cache = self.__predict_cache = (self.weights, np.empty(shape, dtype=self.weights.dtype))
+        return np.matmul(x, self.weights, out=cache[1] if out is None else out)
             
+    def __resolve_dtype(self, X: np.ndarray) -> np.dtype:
+        if self.dtype is not None:
+            return np.dtype(self.dtype)
+        return X.dtype if X.dtype in [np.float32, np.float64] else np.dtype(np.float64)
+    
+    def __normal_equations(self, X_train: np.ndarray, y_train: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """X^T X and X^T y accumulated in float64, converting lower 
+        precision inputs one chunk at a time
+        """
+        if X_train.dtype == np.float64 and y_train.dtype == np.float64:
+            return X_train.T @ X_train, X_train.T @ y_train
+        gram = np.zeros((X_train.shape[1], X_train.shape[1]))
+        moment = np.zeros((X_train.shape[1],) + y_train.shape[1:])
+        for start in range(0, len(X_train), self.chunk_size):
+            X_ = X_train[start:start + self.chunk_size].astype(np.float64)
+            gram += X_.T @ X_
+            moment += X_.T @ y_train[start:start + self.chunk_size].astype(np.float64)
+        return gram, moment
+        
     def __solve_pinv(self, X_train: np.ndarray, y_train: np.ndarray):
-        self.weights = np.linalg.pinv(X_train) @ y_train
+        X_train = X_train.astype(np.float64, copy=False)
+        self.weights = np.linalg.pinv(X_train) @ y_train.astype(np.float64, copy=False)
+        
+    def __solve_cholesky(self, X_train: np.ndarray, y_train: np.ndarray, normal_equations: tuple = None):
+        gram, moment = self.__normal_equations(X_train, y_train) if normal_equations is None else normal_equations
+        try:
+            L = np.linalg.cholesky(gram)
+        except np.linalg.LinAlgError:
+            self.__solve_pinv(X_train, y_train)
+            return
+        z = np.linalg.solve(L, moment)
+        self.weights = np.linalg.solve(L.T, z)
+        
+    def __solve_qr(self, X_train: np.ndarray, y_train: np.ndarray):
+        X_train = X_train.astype(np.float64, copy=False)
+        y_train = y_train.astype(np.float64, copy=False)
+        Q, R = np.linalg.qr(X_train)
+        diag = np.abs(np.diag(R))
+        if len(diag) < X_train.shape[1] or diag.min() <= diag.max() * max(X_train.shape) * np.finfo(R.dtype).eps:
+            self.__solve_pinv(X_train, y_train)
+            return
+        self.weights = np.linalg.solve(R, Q.T @ y_train)
+        
+    def __solve_lstsq(self, X_train: np.ndarray, y_train: np.ndarray):
+        X_train = X_train.astype(np.float64, copy=False)
+        y_train = y_train.astype(np.float64, copy=False)
+        self.weights = np.linalg.lstsq(X_train, y_train, rcond=None)[0]
+        
+    def __solve_auto(self, X_train: np.ndarray, y_train: np.ndarray):
+        # Cholesky squares the condition number and QR does not, so the 
+        # cheap eigenvalue estimate of cond(X^T X) picks the fastest solver
+        # that stays accurate, leaving the SVD for (nearly) singular systems
+        n_samples, n_features = X_train.shape
+        if n_samples < n_features:
+            self.__solve_pinv(X_train, y_train)
+            return
+        normal_equations = self.__normal_equations(X_train, y_train)
+        eigvals = np.linalg.eigvalsh(normal_equations[0])
+        cond = eigvals[-1] / eigvals[0] if eigvals[0] > 0 else np.inf
+        if cond < LIN_REG_CHOLESKY_MAX_COND:
+            self.__solve_cholesky(X_train, y_train, normal_equations)
+        elif cond < LIN_REG_QR_MAX_COND:
+            self.__solve_qr(X_train, y_train)
+        else:
+            self.__solve_pinv(X_train, y_train)
+        
+    def __solve_incremental(self, X_train: np.ndarray, y_train: np.ndarray):
+        for start in range(0, len(X_train), self.chunk_size):
+            stop = start + self.chunk_size
+            self.partial_fit(X_train[start:stop], y_train[start:stop])
         
     def __solve_gradient_descent(self, X_train: np.ndarray, y_train: np.ndarray):
-        self.weights = self.__generator.standard_normal((X_train.shape[1], 1))
-        for i in range(self.max_iter):
-            diff = (y_train - self.predict(X_train))
-            grad_w = np.expand_dims(-2 * (diff * X_train).mean(0), -1)            
-            self.weights -= self.learning_rate * grad_w
+        N = len(X_train)
+        y_train = y_train.reshape(N, -1)
+        optimizer = self.__init_iterative(X_train.shape[1], y_train.shape[1], X_train.dtype)
+        diff = np.empty(y_train.shape, dtype=X_train.dtype)
+        grad_w = np.empty(self.weights.shape, dtype=X_train.dtype)
+        for epoch in range(self.max_iter):
+            with self._span("gradient_descent.iteration", rows=N, iteration=epoch) as span:
+                optimizer.set_epoch(epoch)
+                np.matmul(X_train, self.weights, out=diff)
+                diff -= y_train
+                np.matmul(X_train.T, diff, out=grad_w)
+                grad_w *= 2 / N
+                optimizer.step(self.weights, grad_w)
+                loss = np.einsum("ij,ij->", diff, diff, dtype=np.float64) / N
+                span.set(loss=float(loss))
+            if self.__end_epoch(loss):
+                break
     
     def __solve_sgd(self, X_train: np.ndarray, y_train: np.ndarray):
-        self.weights = self.__generator.standard_normal((X_train.shape[1], 1))
+        # a single shuffled copy is sliced into contiguous mini-batches; 
+        # each epoch only shuffles the order in which the batches are visited
         N = len(X_train)
-        for i in range(self.max_iter):
-            idxs = self.__generator.integers(0, N, self.batch_size)
-            X_ = X_train[idxs]
-            y_ = y_train[idxs]
-            diff = (y_ - self.predict(X_))
-            grad_w = np.expand_dims(-2 * (diff * X_).mean(0), -1)
-            self.weights -= self.learning_rate * grad_w
+        idxs = self.__generator.permutation(N)
+        X_ = X_train[idxs]
+        y_ = y_train.reshape(N, -1)[idxs]
+        optimizer = self.__init_iterative(X_train.shape[1], y_.shape[1], X_train.dtype)
+        batch_starts = np.arange(0, N, self.batch_size)
+        diff_buffer = np.empty((min(self.batch_size, N), y_.shape[1]), dtype=X_train.dtype)
+        grad_w = np.empty(self.weights.shape, dtype=X_train.dtype)
+        for epoch in range(self.max_iter):
+            with self._span("sgd.iteration", rows=N, iteration=epoch) as span:
+                optimizer.set_epoch(epoch)
+                loss = 0
+                for start in self.__generator.permutation(batch_starts):
+                    X_batch = X_[start:start + self.batch_size]
+                    diff = diff_buffer[:len(X_batch)]
+                    np.matmul(X_batch, self.weights, out=diff)
+                    diff -= y_[start:start + self.batch_size]
+                    np.matmul(X_batch.T, diff, out=grad_w)
+                    grad_w *= 2 / len(X_batch)
+                    optimizer.step(self.weights, grad_w)
+                    loss += np.einsum("ij,ij->", diff, diff, dtype=np.float64)
+                span.set(loss=float(loss / N))
+            if self.__end_epoch(loss / N):
+                break
             
+    def __init_iterative(self, n_features: int, n_targets: int, dtype: np.dtype):
+        self.weights = self.__generator.standard_normal((n_features, n_targets)).astype(dtype, copy=False)
+        kwargs = {"schedule": self.lr_schedule}
+        if self.optimizer == "sgd":
+            kwargs["momentum"] = self.momentum
+        optimizer = get_optimizer(self.optimizer, self.learning_rate, **kwargs)
+        optimizer.reset(self.weights.shape, self.weights.dtype)
+        self.loss_history = []
+        self.n_iter = 0
+        self.__best_loss = np.inf
+        self.__n_stalled = 0
+        return optimizer
+    
+    def __end_epoch(self, loss: float) -> bool:
+        """Records the training loss of an epoch and returns whether the 
+        loss has not improved by at least `tol` for `n_iter_no_change` 
+        consecutive epochs
+        """
+        self.loss_history.append(loss)
+        self.n_iter += 1
+        if self.tol is None:
+            return False
+        self.__n_stalled = self.__n_stalled + 1 if loss > self.__best_loss - self.tol else 0
+        self.__best_loss = min(self.__best_loss, loss)
+        return self.__n_stalled >= self.n_iter_no_change
@@ -25,21 +25,50 @@ SOFTWARE.
 # site-packages
 import numpy as np
 
+# native
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 # local
 from ..__common import BaseModel
+from .spatial_index import KDTree, BallTree, RandomProjectionForest
+from .prototypes import KNN_PROTOTYPES, kmeans_prototypes, condensed_prototypes
 
 
 KNN_REDUCTIONS = ["mean", "median"]
+KNN_ALGORITHMS = ["auto", "brute", "kd_tree", "ball_tree", "rp_forest"]
+KNN_TREES = {"kd_tree": KDTree, "ball_tree": BallTree}
+KNN_AUTO_MAX_TREE_FEATURES = 6
+KNN_AUTO_TREE_MIN_ROWS = 2000
+KNN_COMPACT_FRACTION = 0.5
 
 
 class KnnRegressor(BaseModel):
+    _transient_attributes = ["_KnnRegressor__predict_cache", "_KnnRegressor__buffers"]
+    
     def __init__(self, 
                  name: str = "knn_regressor",
                  k: int = 3,
-                 reduction: str = "mean"
+                 reduction: str = "mean",
+                 block_size: int = 1024,
+                 algorithm: str = "auto",
+                 leaf_size: int = 40,
+                 n_jobs: int = None,
+                 n_trees: int = 10,
+                 random_state: int = 0,
+                 dtype: np.dtype = None,
+                 prototypes: str = None,
+                 n_prototypes: int = None,
+                 prototype_tolerance: float = None
                 ):
         assert reduction in KNN_REDUCTIONS, "Invalid reduction mode: {reduction}. Options are {KNN_REDUCTIONS}"
         assert k > 0, "The number of neighbors 'k' must be greater than 0. Got k = {k}."
+        assert algorithm in KNN_ALGORITHMS, f"Invalid algorithm: {algorithm}. Options are {KNN_ALGORITHMS}"
+        assert block_size > 0, f"The block size must be greater than 0. Got block_size = {block_size}."
+        assert prototypes in [None] + KNN_PROTOTYPES, f"Invalid prototypes: {prototypes}. Options are {KNN_PROTOTYPES}"
+        assert prototypes != "kmeans" or n_prototypes, "The 'kmeans' prototypes need n_prototypes."
+        assert prototypes != "condensed" or prototype_tolerance is not None, \
+            "The 'condensed' prototypes need prototype_tolerance."
         self.name = name
         super().__init__(name)
         self.k = k
@@ -48,20 +77,336 @@ class KnnRegressor(BaseModel):
             self.rdfunc = np.mean
         else:
             self.rdfunc = np.median
+        self.block_size = block_size
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.n_jobs = n_jobs
+        self.n_trees = n_trees
+        self.random_state = random_state
+        self.dtype = dtype
+        self.prototypes = prototypes
+        self.n_prototypes = n_prototypes
+        self.prototype_tolerance = prototype_tolerance
         self.X_train = None
         self.y_train = None
+        self.train_norms = None
+        self.tree = None
+        self.__predict_cache = None
+        self.__buffers = None
+        self.__index_size = 0
+        self.__n_removed = 0
+        self.__n_index_removed = 0
         
     def fit(self, X_train: np.ndarray, y_train: np.ndarray):
+        # distances are computed in the training set dtype, so a float32 
+        # model halves the memory traffic of the search
+        if self.dtype is not None:
+            X_train = X_train.astype(self.dtype, copy=False)
+        elif not np.issubdtype(X_train.dtype, np.floating):
+            # removed rows are marked by an infinite norm, and integer 
+            # queries would be truncated to the training set dtype
+            X_train = X_train.astype(np.float64)
+        # the reference set can be replaced by a smaller set of prototypes
+        if self.prototypes == "kmeans":
+            X_train, y_train = kmeans_prototypes(X_train, y_train, self.n_prototypes, 
+                                                 random_state=self.random_state, block_size=self.block_size)
+        elif self.prototypes == "condensed":
+            X_train, y_train = condensed_prototypes(X_train, y_train, self.prototype_tolerance, self.n_prototypes,
+                                                    random_state=self.random_state, block_size=self.block_size)
         self.X_train = X_train
         self.y_train = y_train
+        self.train_norms = np.einsum("ij,ij->i", X_train, X_train)
+        self.__buffers = None
+        self.__n_removed = 0
+        self.__build_index()
+        
+    def partial_fit(self, X_train: np.ndarray, y_train: np.ndarray):
+        return self.add(X_train, y_train)
+        
+    def add(self, X: np.ndarray, y: np.ndarray):
+        """Appends reference points without refitting. The rows are 
+        copied into buffers whose capacity doubles when full, so appends 
+        cost a copy and a squared norm per row. With a tree index the new 
+        rows are searched by brute force until they outnumber the indexed
+        ones, then the index is rebuilt over all the rows, removed ones 
+        included. Appends never renumber rows: the new rows take the next
+        indices of X_train and existing ids stay valid for `remove`.
+
+        Args:
+            X (np.ndarray): (n, d) points
+            y (np.ndarray): (n,) or (n, T) targets
+
+        Returns:
+            KnnRegressor: self
+        """
+        if self.X_train is None:
+            self.fit(X, y)
+            return self
+        size, n = len(self.X_train), len(X)
+        self.__reserve(size + n)
+        X_buffer, y_buffer, norm_buffer = self.__buffers
+        X_buffer[size:size + n] = X
+        y_buffer[size:size + n] = np.reshape(y, (n,) + y_buffer.shape[1:])
+        np.einsum("ij,ij->i", X_buffer[size:size + n], X_buffer[size:size + n], out=norm_buffer[size:size + n])
+        self.X_train = X_buffer[:size + n]
+        self.y_train = y_buffer[:size + n]
+        self.train_norms = norm_buffer[:size + n]
+        self.__predict_cache = None
+        if isinstance(self.tree, RandomProjectionForest):
+            # the forest reads the rows it indexes from the training set, 
+            # so it must not keep the array the rows were moved out of
+            self.tree.data = self.X_train
+        if self.tree is not None and len(self.X_train) - self.__index_size > max(self.__index_size, self.leaf_size):
+            self.__build_index()
+        return self
+    
+    def remove(self, ids: np.ndarray):
+        """Removes reference points without refitting. Removed rows are 
+        marked by an infinite squared norm and skipped by every search; 
+        once they are more than `KNN_COMPACT_FRACTION` of the rows the 
+        remaining points are compacted and the index rebuilt, which 
+        renumbers the rows.
+
+        Args:
+            ids (np.ndarray): Row indices of X_train, as returned by `kneighbors`
+
+        Returns:
+            KnnRegressor: self
+        """
+        assert isinstance(self.X_train, np.ndarray), "Model has not been trained yet!"
+        ids = np.unique(np.asarray(ids, dtype=np.intp))
+        assert len(ids) == 0 or (ids[0] >= 0 and ids[-1] < len(self.X_train)), "Row indices out of range!"
+        assert np.all(np.isfinite(self.train_norms[ids])), "Some of the rows were already removed!"
+        if not self.train_norms.flags.writeable:
+            self.train_norms = self.train_norms.copy()
+        self.train_norms[ids] = np.inf
+        self.__n_removed += len(ids)
+        self.__n_index_removed += int(np.count_nonzero(ids < self.__index_size))
+        # the cached k depends on the number of live rows
+        self.__predict_cache = None
+        if self.__n_removed > KNN_COMPACT_FRACTION * len(self.X_train):
+            self.__compact()
+        return self
             
     def predict(self, X: np.ndarray) -> np.ndarray:
-        assert type(self.y_train) == np.ndarray, "Model has not been trained yet!"
-        predictions = np.zeros((X.shape[0], 1))
-        for i, x in enumerate(X):
-            x_ = x[np.newaxis, ...]
-            distances = np.sum((self.X_train - x_)**2, axis=1)
-            ids = np.argsort(distances)
-            nn = self.y_train[ids][:self.k]
-            predictions[i] = self.rdfunc(nn)
-        return predictions
+        assert isinstance(self.y_train, np.ndarray), "Model has not been trained yet!"
+        return self.predict_from_neighbors(self.kneighbors(X))
+    
+    def predict_one(self, x: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """Low-latency prediction of a single (d,) row. The model is 
+        validated and the distance and output buffers allocated on the first
+        call after each fit. Brute force search selects the neighbors with
+        `argpartition` instead of a full sort.
+        
+        Without `out`, the returned array is an internal buffer overwritten 
+        by the next call.
+
+        Args:
+            x (np.ndarray): (d,) row
+            out (np.ndarray, optional): (1,) output buffer. Defaults to None.
+
+        Returns:
+            np.ndarray: (1,) prediction
+        """
+        cache = self.__predict_cache
+        if cache is None or cache[0] is not self.X_train:
+            assert isinstance(self.y_train, np.ndarray), "Model has not been trained yet!"
+            k = min(self.k, len(self.X_train) - self.__n_removed)
+            dist = np.empty(len(self.X_train), dtype=self.X_train.dtype) if self.tree is None else None
+            cache = self.__predict_cache = (self.X_train, k, dist, np.empty(1))
+        _, k, dist, default_out = cache
+        x = x.astype(self.X_train.dtype, copy=False)
+        if self.tree is not None:
+            ids = np.empty((1, k), dtype=np.intp)
+            self.__kneighbors_shard(x[np.newaxis, :], k, ids)
+            ids = ids[0]
+        else:
+            # ||x||^2 is the same for every training row and does not change the ranking
+            np.matmul(self.X_train, x, out=dist)
+            dist *= -2
+            dist += self.train_norms
+            ids = np.argpartition(dist, k - 1)[:k]
+            ids = ids[np.argsort(dist[ids], kind="stable")]
+        out = default_out if out is None else out
+        out[0] = self.rdfunc(self.y_train[ids])
+        return out
+    
+    def predict_from_neighbors(self, neighbors: np.ndarray) -> np.ndarray:
+        """Reduces the targets of precomputed neighbors (as returned by 
+        `kneighbors`) into predictions. Neighbor lists computed for a large
+        k can be truncated to evaluate any smaller k without a new search.
+
+        Args:
+            neighbors (np.ndarray): (n_queries, k) matrix of training row indices
+
+        Returns:
+            np.ndarray: (n_queries, 1) predictions
+        """
+        nn = self.y_train[neighbors].reshape(len(neighbors), -1)
+        return self.rdfunc(nn, axis=1)[:, np.newaxis]
+    
+    def kneighbors(self, X: np.ndarray, k: int = None) -> np.ndarray:
+        """Returns the indices of the k nearest training rows of each query,
+        ordered by increasing distance.
+        
+        With a tree index (`algorithm` "kd_tree"/"ball_tree") each query 
+        runs a pruned depth-first search. With `algorithm` "rp_forest" the
+        search is approximate: only the points sharing a leaf with the query
+        in one of the `n_trees` random projection trees are ranked. Otherwise queries and training 
+        rows are processed in blocks of `block_size` rows, so peak memory 
+        is bounded by a (block_size, block_size) distance matrix regardless
+        of the size of either set.
+        
+        If `n_jobs` > 1 (or -1 for all cores) the brute force queries are 
+        split into contiguous shards searched by a thread pool; NumPy 
+        releases the GIL in the distance kernels and every shard writes to 
+        its own rows of the output, so results are identical to the serial 
+        search. Tree and forest searches are Python loops holding the GIL, 
+        so they always run serially and ignore `n_jobs`.
+        
+        Rows added with `add` after the index was built are searched by 
+        brute force and merged in; rows marked by `remove` are never returned.
+
+        Args:
+            X (np.ndarray): Query matrix
+            k (int, optional): Number of neighbors. Defaults to self.k.
+
+        Returns:
+            np.ndarray: (n_queries, k) matrix of training row indices
+        """
+        assert isinstance(self.X_train, np.ndarray), "Model has not been trained yet!"
+        k = min(self.k if k is None else k, len(self.X_train) - self.__n_removed)
+        neighbors = np.empty((len(X), k), dtype=np.intp)
+        n_jobs = self.n_jobs or 1
+        if n_jobs < 0:
+            n_jobs = os.cpu_count()
+        n_jobs = max(1, min(n_jobs, len(X)))
+        if n_jobs == 1 or self.tree is not None:
+            self.__kneighbors_shard(X, k, neighbors)
+            return neighbors
+        bounds = np.linspace(0, len(X), n_jobs + 1).astype(int)
+        with ThreadPoolExecutor(n_jobs) as pool:
+            futures = [
+                pool.submit(self.__kneighbors_shard, X[start:stop], k, neighbors[start:stop])
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            for future in futures:
+                future.result()
+        return neighbors
+    
+    def __kneighbors_shard(self, X: np.ndarray, k: int, out: np.ndarray):
+        if self.tree is None:
+            for start in range(0, len(X), self.block_size):
+                stop = start + self.block_size
+                out[start:stop] = self.__kneighbors_block(X[start:stop], k)[1]
+            return
+        # the index skips removed rows itself, and may hold fewer than k 
+        # live rows when the rows added since it was built make up the rest
+        index_k = min(k, self.__index_size - self.__n_index_removed)
+        removed = np.isinf(self.train_norms[:self.__index_size]) if self.__n_index_removed else None
+        with self._span("kneighbors.tree_query", rows=len(X)):
+            if index_k:
+                ids = self.tree.query(X, index_k, removed)
+            else:
+                ids = np.empty((len(X), 0), dtype=np.intp)
+        if self.__index_size == len(self.X_train):
+            out[:] = ids
+            return
+        for start in range(0, len(X), self.block_size):
+            stop = start + self.block_size
+            X_block = X[start:stop].astype(self.X_train.dtype, copy=False)
+            index_ids = ids[start:stop]
+            index_dist = np.einsum("ij,ikj->ik", X_block, self.X_train[index_ids])
+            index_dist *= -2
+            index_dist += np.einsum("ij,ij->i", X_block, X_block)[:, np.newaxis]
+            index_dist += self.train_norms[index_ids]
+            np.maximum(index_dist, 0, out=index_dist)
+            new_dist, new_ids = self.__kneighbors_block(X_block, k, self.__index_size)
+            dist = np.hstack([index_dist, new_dist])
+            order = np.argsort(dist, axis=1, kind="stable")[:, :k]
+            out[start:stop] = np.take_along_axis(np.hstack([index_ids, new_ids]), order, axis=1)
+            
+    def __reserve(self, n_rows: int):
+        """Makes room for `n_rows` rows, moving the training data into 
+        buffers of twice the needed capacity when full
+        """
+        if self.__buffers is not None and len(self.__buffers[0]) >= n_rows:
+            return
+        size = len(self.X_train)
+        capacity = max(n_rows, 2 * size)
+        X_buffer = np.empty((capacity,) + self.X_train.shape[1:], dtype=self.X_train.dtype)
+        y_buffer = np.empty((capacity,) + self.y_train.shape[1:], dtype=self.y_train.dtype)
+        norm_buffer = np.empty(capacity, dtype=self.train_norms.dtype)
+        X_buffer[:size] = self.X_train
+        y_buffer[:size] = self.y_train
+        norm_buffer[:size] = self.train_norms
+        self.__buffers = (X_buffer, y_buffer, norm_buffer)
+        
+    def __compact(self):
+        """Drops the removed rows and rebuilds the index over all points"""
+        if self.__n_removed:
+            keep = np.isfinite(self.train_norms)
+            self.X_train = self.X_train[keep]
+            self.y_train = self.y_train[keep]
+            self.train_norms = self.train_norms[keep]
+            self.__buffers = None
+            self.__n_removed = 0
+        self.__build_index()
+        
+    def __build_index(self):
+        self.tree = None
+        self.__index_size = 0
+        self.__n_index_removed = self.__n_removed
+        algorithm = self.__resolve_algorithm()
+        if algorithm == "rp_forest":
+            self.tree = RandomProjectionForest(self.X_train, self.n_trees, self.leaf_size, self.random_state)
+        elif algorithm != "brute":
+            self.tree = KNN_TREES[algorithm](self.X_train, self.leaf_size)
+        if self.tree is not None:
+            self.__index_size = len(self.X_train)
+    
+    def __resolve_algorithm(self) -> str:
+        if self.algorithm != "auto":
+            return self.algorithm
+        n_samples, n_features = self.X_train.shape
+        # the tree search runs in Python, so it only beats the vectorized 
+        # brute force when it prunes most of the rows: few features and 
+        # about KNN_AUTO_TREE_MIN_ROWS rows per cell of the 2^d space
+        if n_features > KNN_AUTO_MAX_TREE_FEATURES or n_samples < KNN_AUTO_TREE_MIN_ROWS << n_features \
+                or self.k >= n_samples // 2:
+            return "brute"
+        return "kd_tree"
+    
+    def __kneighbors_block(self, X: np.ndarray, k: int, first: int = 0) -> tuple[np.ndarray, np.ndarray]:
+        """Brute force search over the training rows from `first` on, 
+        returning the sorted distances and indices of up to k neighbors
+        """
+        X = X.astype(self.X_train.dtype, copy=False)
+        x_norms = np.einsum("ij,ij->i", X, X)[:, np.newaxis]
+        best_dist = np.empty((len(X), 0), dtype=X.dtype)
+        best_ids = np.empty((len(X), 0), dtype=np.intp)
+        for start in range(first, len(self.X_train), self.block_size):
+            stop = start + self.block_size
+            with self._span("kneighbors.distance", rows=len(X)):
+                dist = X @ self.X_train[start:stop].T
+                dist *= -2
+                dist += x_norms
+                dist += self.train_norms[np.newaxis, start:stop]
+                np.maximum(dist, 0, out=dist)
+            with self._span("kneighbors.top_k", rows=len(X)):
+                ids = np.arange(start, start + dist.shape[1])
+                if dist.shape[1] > k:
+                    part = np.argpartition(dist, k - 1, axis=1)[:, :k]
+                    dist = np.take_along_axis(dist, part, axis=1)
+                    ids = ids[part]
+                else:
+                    ids = np.broadcast_to(ids, dist.shape)
+                best_dist = np.hstack([best_dist, dist])
+                best_ids = np.hstack([best_ids, ids])
+                if best_dist.shape[1] > k:
+                    part = np.argpartition(best_dist, k - 1, axis=1)[:, :k]
+                    best_dist = np.take_along_axis(best_dist, part, axis=1)
+                    best_ids = np.take_along_axis(best_ids, part, axis=1)
+        with self._span("kneighbors.top_k", rows=len(X)):
+            order = np.argsort(best_dist, axis=1, kind="stable")
+            return np.take_along_axis(best_dist, order, axis=1), np.take_along_axis(best_ids, order, axis=1)
@@ -0,0 +1,210 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# site-packages
+import numpy as np
+
+# native
+import tracemalloc
+from time import perf_counter
+
+# local
+from ..metrics import RegressionMetrics
+
+
+KNN_PROTOTYPES = ["kmeans", "condensed"]
+
+
+def nearest_prototype(X: np.ndarray, prototypes: np.ndarray, block_size: int = 1024) -> np.ndarray:
+    """Index of the closest prototype of every row, computed in blocks of 
+    rows so the distance matrix stays (block_size, n_prototypes)
+
+    Args:
+        X (np.ndarray): (n, d) points
+        prototypes (np.ndarray): (m, d) prototypes
+        block_size (int, optional): Rows per block. Defaults to 1024.
+
+    Returns:
+        np.ndarray: (n,) prototype indices
+    """
+    norms = np.einsum("ij,ij->i", prototypes, prototypes)
+    labels = np.empty(len(X), dtype=np.intp)
+    for start in range(0, len(X), block_size):
+        dist = X[start:start + block_size] @ prototypes.T
+        dist *= -2
+        dist += norms
+        labels[start:start + block_size] = np.argmin(dist, axis=1)
+    return labels
+
+def kmeans_prototypes(X: np.ndarray, 
+                      y: np.ndarray, 
+                      n_prototypes: int, 
+                      max_iter: int = 10, 
+                      random_state: int = 0,
+                      block_size: int = 1024
+                     ) -> tuple[np.ndarray, np.ndarray]:
+    """Quantizes the reference set with Lloyd's k-means. Each prototype is
+    the centroid of its cluster and its target the mean target of the 
+    cluster; clusters left empty are dropped. Integer points and targets
+    give float64 prototypes and targets.
+
+    Args:
+        X (np.ndarray): (n, d) points
+        y (np.ndarray): (n,) or (n, T) targets
+        n_prototypes (int): Number of clusters
+        max_iter (int, optional): Lloyd iterations. Defaults to 10.
+        random_state (int, optional): Seed of the initial centroids. Defaults to 0.
+        block_size (int, optional): Rows per distance block. Defaults to 1024.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Prototypes and their targets
+    """
+    assert n_prototypes > 0, f"The number of prototypes must be greater than 0. Got n_prototypes = {n_prototypes}."
+    if n_prototypes >= len(X):
+        return X, y
+    generator = np.random.default_rng(random_state)
+    centers = X[np.sort(generator.choice(len(X), n_prototypes, replace=False))].astype(np.float64)
+    labels = None
+    for _ in range(max_iter):
+        new_labels = nearest_prototype(X, centers, block_size)
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        clusters, sums = _cluster_sums(X, labels)
+        # empty clusters keep their previous centroid
+        centers[clusters] = sums / np.bincount(labels)[clusters, np.newaxis]
+    labels = nearest_prototype(X, centers, block_size)
+    clusters, sums = _cluster_sums(X, labels)
+    counts = np.bincount(labels)[clusters]
+    _, target_sums = _cluster_sums(y.reshape(len(y), -1), labels)
+    targets = (target_sums / counts[:, np.newaxis]).reshape((len(clusters),) + y.shape[1:])
+    # means of integer values are kept in float64 instead of being truncated
+    centers = (sums / counts[:, np.newaxis]).astype(_mean_dtype(X.dtype), copy=False)
+    return centers, targets.astype(_mean_dtype(y.dtype), copy=False)
+
+def _mean_dtype(dtype: np.dtype) -> np.dtype:
+    return dtype if np.issubdtype(dtype, np.floating) else np.dtype(np.float64)
+
+def _cluster_sums(values: np.ndarray, labels: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sums the rows of every non-empty cluster with a single sort"""
+    order = np.argsort(labels, kind="stable")
+    sorted_labels = labels[order]
+    starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]])
+    return sorted_labels[starts], np.add.reduceat(values[order].astype(np.float64), starts, axis=0)
+
+def condensed_prototypes(X: np.ndarray, 
+                         y: np.ndarray, 
+                         tolerance: float, 
+                         n_prototypes: int = None,
+                         max_iter: int = 10,
+                         random_state: int = 0,
+                         block_size: int = 1024
+                        ) -> tuple[np.ndarray, np.ndarray]:
+    """Condensed nearest neighbor rule for regression: rows are visited in
+    random order and kept only if the target of their nearest kept row 
+    differs from their own by more than `tolerance`. Rows are tested a 
+    block at a time against the rows kept so far, and the passes repeat 
+    until no row is added.
+
+    Args:
+        X (np.ndarray): (n, d) points
+        y (np.ndarray): (n,) or (n, T) targets
+        tolerance (float): Largest absolute target error of an absorbed row
+        n_prototypes (int, optional): Maximum number of kept rows. 
+                                        Defaults to None.
+        max_iter (int, optional): Maximum number of passes. Defaults to 10.
+        random_state (int, optional): Seed of the visiting order. Defaults to 0.
+        block_size (int, optional): Rows tested per block. Defaults to 1024.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Kept points and their targets, in 
+                                        their original order
+    """
+    assert tolerance >= 0, f"The tolerance must not be negative. Got tolerance = {tolerance}."
+    limit = len(X) if n_prototypes is None else n_prototypes
+    y_ = y.reshape(len(y), -1)
+    order = np.random.default_rng(random_state).permutation(len(X))
+    kept = np.zeros(len(X), dtype=bool)
+    kept[order[0]] = True
+    kept_ids = [order[:1]]
+    n_kept = 1
+    for _ in range(max_iter):
+        n_added = 0
+        for start in range(0, len(X), block_size):
+            if n_kept >= limit:
+                break
+            block = order[start:start + block_size]
+            block = block[~kept[block]]
+            if len(block) == 0:
+                continue
+            prototype_ids = np.concatenate(kept_ids)
+            nearest = prototype_ids[nearest_prototype(X[block], X[prototype_ids], block_size)]
+            error = np.abs(y_[block] - y_[nearest]).max(axis=1)
+            missed = block[error > tolerance][:limit - n_kept]
+            kept[missed] = True
+            kept_ids.append(missed)
+            n_kept += len(missed)
+            n_added += len(missed)
+        if n_added == 0:
+            break
+    return X[kept], y[kept]
+
+def reduction_report(full_model, reduced_model, X_test: np.ndarray, y_test: np.ndarray) -> dict:
+    """Compares a KnnRegressor fitted on the whole reference set with one 
+    fitted on prototypes: accuracy of both on a test set, reference set 
+    size and memory, and prediction time and peak memory
+
+    Args:
+        full_model (KnnRegressor): Model without reduction
+        reduced_model (KnnRegressor): Model with prototypes
+        X_test (np.ndarray): Test points
+        y_test (np.ndarray): Test targets
+
+    Returns:
+        dict: "full" and "reduced" results and the relative "gain" / "loss"
+    """
+    report = dict()
+    for label, model in [("full", full_model), ("reduced", reduced_model)]:
+        tracemalloc.start()
+        start = perf_counter()
+        y_pred = model.predict(X_test)
+        elapsed = perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        report[label] = dict(RegressionMetrics().update(y_test, y_pred).result(),
+                             n_reference=len(model.X_train),
+                             reference_bytes=model.X_train.nbytes + model.y_train.nbytes,
+                             predict_time=elapsed,
+                             predict_peak_memory=peak)
+    full, reduced = report["full"], report["reduced"]
+    report["gain"] = {
+        "size_ratio": reduced["n_reference"] / full["n_reference"],
+        "speedup": full["predict_time"] / reduced["predict_time"] if reduced["predict_time"] > 0 else float("inf"),
+        "memory_ratio": reduced["reference_bytes"] / full["reference_bytes"],
+    }
+    report["loss"] = {
+        "mse_increase": reduced["mse"] - full["mse"],
+        "r2_decrease": full["r2_score"] - reduced["r2_score"],
+    }
+    return report
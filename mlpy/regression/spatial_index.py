@@ -0,0 +1,281 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# site-packages
+import numpy as np
+
+
+class SpatialTree:
+    """Array-backed binary space partitioning tree for exact k-nearest 
+    neighbor queries
+    
+    Nodes are stored in heap order (children of node i are 2i + 1 and 2i + 2)
+    and every node covers a contiguous range of the reordered training data,
+    so the whole structure lives in a handful of NumPy arrays. Subclasses 
+    define the node bounds and the lower bound of the distance to a node.
+    """
+    def __init__(self, X: np.ndarray, leaf_size: int = 40):
+        """
+
+        Args:
+            X (np.ndarray): Reference points
+            leaf_size (int, optional): Maximum number of points in a leaf.
+                                        Defaults to 40.
+        """
+        assert leaf_size > 0, f"The leaf size must be greater than 0. Got leaf_size = {leaf_size}."
+        self.leaf_size = leaf_size
+        n_samples = len(X)
+        n_levels = 1
+        while n_samples > leaf_size * 2**n_levels:
+            n_levels += 1
+        self.n_nodes = 2**n_levels - 1
+        self.idx_array = np.arange(n_samples)
+        self.node_start = np.zeros(self.n_nodes, dtype=np.intp)
+        self.node_end = np.zeros(self.n_nodes, dtype=np.intp)
+        self._allocate_bounds(X.shape[1])
+        self.__build(X)
+        self.data = np.ascontiguousarray(X[self.idx_array])
+        for node in range(self.n_nodes):
+            start, end = self.node_start[node], self.node_end[node]
+            self._set_bounds(node, self.data[start:end])
+            
+    def __build(self, X: np.ndarray):
+        self.node_end[0] = len(X)
+        for node in range(self.n_nodes):
+            left = 2 * node + 1
+            if left >= self.n_nodes:
+                continue
+            start, end = self.node_start[node], self.node_end[node]
+            ids = self.idx_array[start:end]
+            points = X[ids]
+            dim = np.argmax(points.max(0) - points.min(0)) if len(ids) else 0
+            mid = len(ids) // 2
+            if 0 < mid < len(ids):
+                order = np.argpartition(points[:, dim], mid)
+                self.idx_array[start:end] = ids[order]
+            self.node_start[left], self.node_end[left] = start, start + mid
+            self.node_start[left + 1], self.node_end[left + 1] = start + mid, end
+            
+    def _allocate_bounds(self, n_features: int):
+        raise NotImplementedError(f"Not available for {self.__class__}")
+    
+    def _set_bounds(self, node: int, points: np.ndarray):
+        raise NotImplementedError(f"Not available for {self.__class__}")
+            
+    def _min_dist(self, node: int, x: np.ndarray) -> float:
+        raise NotImplementedError(f"Not available for {self.__class__}")
+    
+    def query(self, X: np.ndarray, k: int, removed: np.ndarray = None) -> np.ndarray:
+        """Returns the indices of the k nearest reference points of each 
+        query, ordered by increasing distance
+
+        Args:
+            X (np.ndarray): Query matrix
+            k (int): Number of neighbors, at most the number of points not
+                        in `removed`
+            removed (np.ndarray, optional): Boolean mask of the reference 
+                                            points to skip. Defaults to None.
+
+        Returns:
+            np.ndarray: (n_queries, k) matrix of reference point indices
+        """
+        # in the order of self.data, so a leaf reads a contiguous slice
+        skip = None if removed is None else removed[self.idx_array]
+        neighbors = np.empty((len(X), k), dtype=np.intp)
+        for i, x in enumerate(X):
+            neighbors[i] = self.__query_one(x, k, skip)
+        return neighbors
+    
+    def __query_one(self, x: np.ndarray, k: int, skip: np.ndarray) -> np.ndarray:
+        best_dist = np.full(k, np.inf)
+        best_ids = np.zeros(k, dtype=np.intp)
+        kth = np.inf
+        stack = [(self._min_dist(0, x), 0)]
+        while stack:
+            bound, node = stack.pop()
+            if bound > kth:
+                continue
+            left = 2 * node + 1
+            if left < self.n_nodes:
+                d_left = self._min_dist(left, x)
+                d_right = self._min_dist(left + 1, x)
+                if d_left <= d_right:
+                    stack.append((d_right, left + 1))
+                    stack.append((d_left, left))
+                else:
+                    stack.append((d_left, left))
+                    stack.append((d_right, left + 1))
+                continue
+            start, end = self.node_start[node], self.node_end[node]
+            dist = np.sum((self.data[start:end] - x)**2, axis=1)
+            if skip is not None:
+                dist = np.where(skip[start:end], np.inf, dist)
+            dist = np.concatenate([best_dist, dist])
+            ids = np.concatenate([best_ids, np.arange(start, end)])
+            part = np.argpartition(dist, k - 1)[:k]
+            best_dist, best_ids = dist[part], ids[part]
+            kth = best_dist.max()
+        order = np.argsort(best_dist, kind="stable")
+        return self.idx_array[best_ids[order]]
+    
+    
+class KDTree(SpatialTree):
+    """KD-tree: nodes are bounded by axis-aligned boxes and split along the
+    dimension of largest spread
+    """
+    def _allocate_bounds(self, n_features: int):
+        self.lower = np.zeros((self.n_nodes, n_features))
+        self.upper = np.zeros((self.n_nodes, n_features))
+        
+    def _set_bounds(self, node: int, points: np.ndarray):
+        if len(points):
+            self.lower[node] = points.min(0)
+            self.upper[node] = points.max(0)
+        
+    def _min_dist(self, node: int, x: np.ndarray) -> float:
+        gap = np.maximum(self.lower[node] - x, 0) + np.maximum(x - self.upper[node], 0)
+        return gap @ gap
+    
+    
+class BallTree(SpatialTree):
+    """Ball tree: nodes are bounded by hyperspheres around their centroid
+    """
+    def _allocate_bounds(self, n_features: int):
+        self.centroid = np.zeros((self.n_nodes, n_features))
+        self.radius = np.zeros(self.n_nodes)
+        
+    def _set_bounds(self, node: int, points: np.ndarray):
+        if len(points):
+            self.centroid[node] = points.mean(0)
+            self.radius[node] = np.sqrt(np.max(np.sum((points - self.centroid[node])**2, axis=1)))
+        
+    def _min_dist(self, node: int, x: np.ndarray) -> float:
+        diff = x - self.centroid[node]
+        gap = max(np.sqrt(diff @ diff) - self.radius[node], 0)
+        return gap * gap
+    
+    
+class RandomProjectionForest:
+    """Forest of random projection trees for approximate k-nearest neighbor
+    queries
+    
+    Every tree splits its nodes at the median of the projection of the 
+    points onto a random direction. A query descends each tree to a single 
+    leaf and the exact distances are only computed for the union of those 
+    leaves, so more trees trade speed for recall. Trees share the heap-order
+    layout of `SpatialTree`, stacked into (n_trees, ...) arrays. The trees 
+    only hold indices: `data` is the reference array itself, not a copy.
+    """
+    def __init__(self, 
+                 X: np.ndarray, 
+                 n_trees: int = 10, 
+                 leaf_size: int = 40, 
+                 random_state: int = 0
+                ):
+        """
+
+        Args:
+            X (np.ndarray): Reference points
+            n_trees (int, optional): Number of trees. Defaults to 10.
+            leaf_size (int, optional): Maximum number of points in a leaf.
+                                        Defaults to 40.
+            random_state (int, optional): Random seed for the projections.
+                                            Defaults to 0.
+        """
+        assert n_trees > 0, f"The number of trees must be greater than 0. Got n_trees = {n_trees}."
+        assert leaf_size > 0, f"The leaf size must be greater than 0. Got leaf_size = {leaf_size}."
+        self.n_trees = n_trees
+        self.leaf_size = leaf_size
+        self.random_state = random_state
+        self.__generator = np.random.default_rng(self.random_state)
+        self.data = X
+        n_samples, n_features = X.shape
+        self.n_levels = 1
+        while n_samples > leaf_size * 2**self.n_levels:
+            self.n_levels += 1
+        self.n_nodes = 2**self.n_levels - 1
+        n_internal = self.n_nodes // 2
+        self.idx_array = np.tile(np.arange(n_samples), (n_trees, 1))
+        self.node_start = np.zeros((n_trees, self.n_nodes), dtype=np.intp)
+        self.node_end = np.zeros((n_trees, self.n_nodes), dtype=np.intp)
+        self.direction = self.__generator.standard_normal((n_trees, n_internal, n_features))
+        self.threshold = np.zeros((n_trees, n_internal))
+        for tree in range(n_trees):
+            self.__build(tree)
+            
+    def __build(self, tree: int):
+        idx_array = self.idx_array[tree]
+        node_start, node_end = self.node_start[tree], self.node_end[tree]
+        node_end[0] = len(idx_array)
+        for node in range(self.n_nodes // 2):
+            left = 2 * node + 1
+            start, end = node_start[node], node_end[node]
+            ids = idx_array[start:end]
+            projection = self.data[ids] @ self.direction[tree, node]
+            mid = len(ids) // 2
+            if 0 < mid < len(ids):
+                order = np.argpartition(projection, mid)
+                idx_array[start:end] = ids[order]
+                self.threshold[tree, node] = np.max(projection[order[:mid]])
+            node_start[left], node_end[left] = start, start + mid
+            node_start[left + 1], node_end[left + 1] = start + mid, end
+    
+    def query(self, X: np.ndarray, k: int, removed: np.ndarray = None) -> np.ndarray:
+        """Returns the indices of the (approximate) k nearest reference 
+        points of each query, ordered by increasing distance
+
+        Args:
+            X (np.ndarray): Query matrix
+            k (int): Number of neighbors, at most the number of points not
+                        in `removed`
+            removed (np.ndarray, optional): Boolean mask of the reference 
+                                            points to skip. Defaults to None.
+
+        Returns:
+            np.ndarray: (n_queries, k) matrix of reference point indices
+        """
+        leaves = np.zeros((self.n_trees, len(X)), dtype=np.intp)
+        for tree in range(self.n_trees):
+            node = leaves[tree]
+            for _ in range(self.n_levels - 1):
+                projection = np.einsum("ij,ij->i", X, self.direction[tree, node])
+                node = 2 * node + 1 + (projection > self.threshold[tree, node])
+            leaves[tree] = node
+        neighbors = np.empty((len(X), k), dtype=np.intp)
+        for i, x in enumerate(X):
+            candidates = np.unique(np.concatenate([
+                self.idx_array[tree, self.node_start[tree, leaf]:self.node_end[tree, leaf]]
+                for tree, leaf in enumerate(leaves[:, i])
+            ]))
+            if removed is not None:
+                candidates = candidates[~removed[candidates]]
+            if len(candidates) < k:
+                # only the indexed rows: `data` may have grown past them
+                n_samples = self.idx_array.shape[1]
+                candidates = np.arange(n_samples) if removed is None else np.flatnonzero(~removed[:n_samples])
+            dist = np.sum((self.data[candidates] - x)**2, axis=1)
+            part = np.argpartition(dist, k - 1)[:k]
+            order = np.argsort(dist[part], kind="stable")
+            neighbors[i] = candidates[part[order]]
+        return neighbors
@@ -0,0 +1,133 @@
+"""
+MIT License
+
+Copyright (c) 2023 Gabriel Tavares (booleangabs)
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# site-packages
+import numpy as np
+
+# native
+import asyncio
+from concurrent.futures import Executor
+
+# local
+from .__common import BaseModel
+
+
+class AsyncBatchPredictor:
+    """Micro-batching wrapper for serving a model from asyncio code
+    
+    Concurrent `await predictor.predict(x)` calls are queued and collected
+    into batches of up to `max_batch_size` rows, waiting at most `max_wait`
+    seconds after the first row of a batch. Each batch runs as a single 
+    `model.predict` call in an executor thread, so the event loop is never
+    blocked, and every caller receives its own row of the result.
+    """
+    def __init__(self, 
+                 model: BaseModel, 
+                 max_batch_size: int = 64, 
+                 max_wait: float = 1e-3,
+                 executor: Executor = None
+                ):
+        """
+
+        Args:
+            model (BaseModel): Trained model
+            max_batch_size (int, optional): Maximum rows per batch. 
+                                            Defaults to 64.
+            max_wait (float, optional): Maximum time in seconds a row waits
+                                        for the batch to fill. Defaults to 1e-3.
+            executor (Executor, optional): Executor running the predictions.
+                                            Defaults to the loop's default.
+        """
+        assert max_batch_size > 0, f"The batch size must be greater than 0. Got max_batch_size = {max_batch_size}."
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+        self.__queue = None
+        self.__worker = None
+        
+    async def predict(self, x: np.ndarray) -> np.ndarray:
+        """Predicts a single row
+
+        Args:
+            x (np.ndarray): (d,) row
+
+        Returns:
+            np.ndarray: Prediction for the row
+        """
+        if self.__worker is None:
+            self.__queue = asyncio.Queue()
+            self.__worker = asyncio.get_running_loop().create_task(self.__run())
+        future = asyncio.get_running_loop().create_future()
+        await self.__queue.put((x, future))
+        return await future
+    
+    async def close(self):
+        """Stops the batching task after the queued rows are served"""
+        if self.__worker is not None:
+            await self.__queue.put(None)
+            await self.__worker
+            self.__worker = None
+            
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        await self.close()
+    
+    async def __run(self):
+        loop = asyncio.get_running_loop()
+        running = True
+        while running:
+            item = await self.__queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if self.__queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.__queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self.__queue.get_nowait()
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            try:
+                rows = np.stack([x for x, _ in batch])
+                predictions = await loop.run_in_executor(self.executor, self.model.predict, rows)
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for (_, future), prediction in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(prediction)